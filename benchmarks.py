@@ -0,0 +1,328 @@
+import argparse #Import argparse to choose which benchmark to run from the command line.
+import asyncio #Import asyncio to drive many quiz sessions at once.
+import csv #Import csv to write synthetic joke files.
+import json #Import json to read and write baseline timings.
+import os #Import os to remove temporary files.
+import platform #Import platform to record where a baseline was measured.
+import random #Import random to generate synthetic data.
+import sys #Import sys to exit non-zero on regressions.
+import tempfile #Import tempfile for scratch data files.
+import time #Import time to measure session throughput.
+import timeit #Import timeit to time each operation.
+import tracemalloc #Import tracemalloc to measure memory per quiz session.
+from collections import Counter #Import Counter to recount histograms when checking the aggregates.
+
+from exercise2 import (PREPROCESSED_SUFFIX, IndexedSampler, iter_question_jokes, load_and_prepare_jokes, #Import the
+                       split_joke) #joke loader, sampler and CSV reader.
+from exercise3 import SEARCH_DISPLAY_LIMIT, StudentDataApp #Import the student app.
+from student_analytics import StudentAnalytics #Import the grade-distribution and ranking engine.
+from student_store import StudentTable, load_table #Import the columnar student store and its loader.
+from quiz_engine import (EVENT_ANSWER, QuizEventLog, QuizSession, QuizSessionManager, ProblemGenerator, #Import the
+                         TRY_AGAIN, read_events, replay) #quiz core and its event log.
+
+BASELINE_FILE = "benchmark_baseline.json" #Default location of the saved suite timings.
+TOLERANCE = 0.25 #Slowdown over the baseline (as a fraction) reported as a regression.
+DRAWS = 1000 #Joke draws timed per call, since one draw is too quick to time alone.
+SETUPS = ["Why did the chicken cross the road", "What do you call a fish with no eyes", #Joke parts for synthetic CSVs.
+          "How many programmers does it take to change a bulb", "Why don't scientists trust atoms"]
+PUNCHLINES = ["To get to the other side", "A fsh", "None, that's a hardware problem", "They make up everything"]
+
+FIRST_NAMES = ["Alice", "Bob", "Carla", "Dmitri", "Eve", "Farah", "Gustavo", "Hana", "Ivan", "Jun"] #Name parts for synthetic rosters.
+LAST_NAMES = ["Smith", "Okafor", "Nguyen", "Garcia", "Kowalski", "Tanaka", "Silva", "Müller", "Haddad", "Rossi"]
+
+
+def make_roster_rows(size, seed=0): #Generate (code, name, m1, m2, m3, exam) rows for a synthetic class.
+    rng = random.Random(seed) #Seeded so every run uses the same roster.
+    return [(1000 + i, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}-{i}", #Unique name per student.
+             rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 100))
+            for i in range(size)]
+
+
+def write_roster_file(file_path, size, seed=0): #Write a synthetic studentMarks.txt file; returns its path.
+    with open(file_path, "w") as file:
+        file.write(f"{size}\n") #First line is the student count.
+        for start in range(0, size, 100000): #Generate in blocks to keep memory flat at 1e7 rows.
+            rows = make_roster_rows(min(100000, size - start), seed + start)
+            file.writelines(f"{start + code}, {name}, {m1}, {m2}, {m3}, {exam}\n" for code, name, m1, m2, m3, exam in rows)
+    return file_path
+
+
+def write_joke_csv(file_path, size, seed=0): #Write a synthetic shortjokes.csv; about two thirds are question jokes.
+    rng = random.Random(seed)
+    with open(file_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["ID", "Joke"])
+        for i in range(size):
+            if rng.random() < 0.67: #Question joke, sometimes with quoting and commas.
+                joke = f"{rng.choice(SETUPS)} #{i}? {rng.choice(PUNCHLINES)}, \"really\""
+            else: #One-liner with no '?', skipped by the loader.
+                joke = f"{rng.choice(PUNCHLINES)} #{i}."
+            writer.writerow([i, joke])
+    return file_path
+
+
+def make_answer_stream(size, seed=0, accuracy=0.7): #Offsets from the right answer a player types; 0 means correct.
+    rng = random.Random(seed)
+    return [0 if rng.random() < accuracy else rng.randint(1, 9) for _ in range(size)]
+
+
+def linear_search(students, selection): #The original next(...) scan, kept for comparison.
+    try: #Search by code.
+        code = int(selection)
+        return next((s for s in students if s.code == code), None)
+    except ValueError: #Search by partial, case-insensitive name.
+        name_lower = selection.lower()
+        return next((s for s in students if name_lower in s.name.lower()), None)
+
+
+def time_call(func, repeat=5): #Return the best time in milliseconds for one call, each run averaging enough calls
+    timer = timeit.Timer(func) #to last at least 0.2 s, so quick calls aren't lost in timer noise.
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1000
+
+
+def play_answer_stream(problem_count, stream): #Score a whole stream of answers through one QuizSession.
+    session = QuizSession(max_questions=problem_count)
+    answers = iter(stream)
+    problem = session.next_problem()
+    while problem is not None:
+        if session.check_answer(problem[3] + next(answers, 0)) != TRY_AGAIN: #Question over: move on.
+            problem = session.next_problem()
+    return session.score
+
+
+def analytics_report(table, key): #Cold grade histogram plus top and bottom 10 by one key, as the app's buttons ask.
+    analytics = StudentAnalytics(table)
+    return analytics.grade_histogram(key), analytics.top_k(10, key), analytics.bottom_k(10, key)
+
+
+def check(failures, condition, message): #Record a wrong result; the suite reports it like a regression.
+    if not condition:
+        failures.append(message)
+
+
+def same_table(left, right): #Whether two tables hold the same rows, names and running statistics.
+    columns = zip(left._columns() + (left._name_pool,), right._columns() + (right._name_pool,))
+    return (all(bytes(a) == bytes(b) for a, b in columns) #Raw buffers of arrays and snapshot memoryviews alike.
+            and consistent_aggregates(left) == consistent_aggregates(right))
+
+
+def consistent_aggregates(table): #The table's aggregates if they match a full recount of its columns, else None.
+    aggregates = table.aggregates
+    totals, exams = table.totals.tolist(), table.exam_marks.tolist()
+    recounted = (len(totals), sum(totals), Counter(totals), Counter(exams), Counter(map(int.__sub__, totals, exams)))
+    if (aggregates.count, aggregates.total_sum, aggregates.histogram, aggregates.mark_histograms["exam"],
+            aggregates.mark_histograms["coursework"]) != recounted:
+        return None
+    if totals and (table.highest().total_score != max(totals) or table.lowest().total_score != min(totals)):
+        return None
+    return recounted
+
+
+def search_matches_scan(table, selection): #Whether the indexed lookup agrees with linear_search.
+    expected = linear_search(table, selection)
+    try:
+        row = table.find_code(int(selection))
+        return (row is None) == (expected is None) and (row is None or table.codes[row] == expected.code)
+    except ValueError:
+        rows, count, exact = table.search_name(selection)
+        query = selection.casefold()
+        matches = sum(query in name.casefold() for name in map(table.name_at, range(len(table))))
+        return ((not rows) == (expected is None) and (expected is None or expected.name in map(table.name_at, rows))
+                and len(rows) == matches and (count == matches if exact else count >= matches))
+
+
+def csv_jokes(file_path): #Every question joke in a CSV, read directly without the index.
+    with open(file_path, 'rb') as file:
+        return [split_joke(fields[joke_column]) for _, joke_column, fields in iter_question_jokes(file)]
+
+
+def record_quizzes(log_path, count): #Record count simulated quizzes; returns the answers logged.
+    recorder = QuizEventLog(log_path)
+    asyncio.run(run_clients(QuizSessionManager(recorder=recorder), count))
+    recorder.close()
+    return sum(kind == EVENT_ANSWER for kind, _, _, _ in read_events(log_path))
+
+
+def remove_file(file_path): #Delete a file if it exists.
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def bench_search(size): #Compare indexed lookups against the linear scan.
+    table = StudentTable() #Build the roster.
+    table.extend(make_roster_rows(size))
+    table.index_codes() #Build the indexes up front, as the loader and the GUI's background indexing do.
+    table.index_names()
+    last_name = table.name_at(size - 1).split()[-1] #e.g. "Smith-99999"; "-99999" alone would parse as a code.
+    queries = {"code": str(1000 + size - 1), "name": last_name} #Worst case for the scan: the last student.
+    for label, query in queries.items(): #Time each query both ways.
+        scan = time_call(lambda: linear_search(table, query))
+        if label == "code": #Code lookups go through the hash index.
+            indexed = time_call(lambda: table.find_code(int(query)))
+        else: #Name lookups go through the trigram index.
+            indexed = time_call(lambda: table.search_name(query, SEARCH_DISPLAY_LIMIT))
+        print(f"search by {label:<5} n={size:<9} scan {scan:10.3f} ms   indexed {indexed:10.3f} ms")
+
+
+async def play_quiz(manager, rng, accuracy=0.7): #One simulated client: answer every question, right with probability accuracy.
+    session_id, problem = await manager.open(rng.randint(1, 3))
+    while problem is not None:
+        answer = problem[3] if rng.random() < accuracy else problem[3] + 1
+        _, problem = await manager.answer(session_id, answer)
+    return await manager.close(session_id)
+
+
+async def run_clients(manager, count, seed=0): #Run count clients concurrently on one event loop.
+    rng = random.Random(seed)
+    return await asyncio.gather(*(play_quiz(manager, rng) for _ in range(count)))
+
+
+def bench_sessions(size): #Sessions completed per second, and memory held by each open session.
+    manager = QuizSessionManager()
+    started = time.perf_counter()
+    asyncio.run(run_clients(manager, size))
+    elapsed = time.perf_counter() - started
+    print(f"quiz sessions n={size:<9} {size / elapsed:12.0f} sessions/s ({elapsed:.2f} s)")
+
+    async def open_all(): #Open size sessions and leave them open.
+        for _ in range(size):
+            await manager.open(1)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    asyncio.run(open_all())
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"quiz sessions n={size:<9} {held / size:12.0f} bytes per open session")
+
+
+def bench_replay(size): #Record size simulated quizzes to an event log, then replay them headlessly.
+    fd, log_path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+    try:
+        recorder = QuizEventLog(log_path)
+        started = time.perf_counter()
+        asyncio.run(run_clients(QuizSessionManager(recorder=recorder), size))
+        recorder.close()
+        recorded = time.perf_counter() - started
+        result = replay(log_path)
+        print(f"quiz replay   n={size:<9} recorded in {recorded:.2f} s ({os.path.getsize(log_path) / 1e6:.1f} MB), "
+              f"replayed {result['answers']} answers in {result['seconds']:.2f} s "
+              f"({result['answers_per_second']:.0f} answers/s), {result['mismatches']} mismatch(es)")
+    finally:
+        os.remove(log_path)
+
+
+def suite_cases(size, workdir, failures): #Yield (case name, callable) pairs for every hot path over synthetic data
+    roster = write_roster_file(os.path.join(workdir, "roster.txt"), size) #of one size, checking results as it goes.
+    app = object.__new__(StudentDataApp) #Headless app: the search methods need no window.
+    yield "student.load_table.parse", lambda: load_table(roster, use_snapshot=False) #The loader the GUI steps through.
+    load_table(roster) #Write the snapshot once...
+    yield "student.load_table.snapshot", lambda: load_table(roster) #...then time loading it.
+    app.students = load_table(roster, use_snapshot=False)
+    check(failures, len(app.students) == size, "student.load_table.parse: wrong number of rows")
+    check(failures, same_table(load_table(roster), app.students), "student.load_table.snapshot: differs from parsing")
+    yield "student.index_names", lambda: load_table(roster).index_names() #The GUI's background indexing, in one go.
+    app.students.index_names()
+    last = len(app.students) - 1 #Worst case for a scan: the last student.
+    last_name = app.students.name_at(last).split()[-1] #e.g. "Smith-99999"; "-99999" alone would parse as a code.
+    yield "student.search.code", lambda: app._find_students(str(app.students.codes[last]))
+    yield "student.search.name", lambda: app._find_students(last_name)
+    yield "student.search.short", lambda: app._find_students("a") #Matches nearly every name.
+    for selection in (str(app.students.codes[last]), last_name, "smith", "-1", "ivan smith-", "nobody", "a", "bo"): #Hits, misses, short queries.
+        check(failures, search_matches_scan(app.students, selection), f"student.search: '{selection}' differs from a scan")
+    yield "student.extreme_score", lambda: (app.students.highest(), app.students.lowest())
+    for key in ("total", "exam", "coursework"): #Fresh analytics each call, so nothing is cached between runs.
+        yield f"student.analytics.{key}", lambda key=key: analytics_report(app.students, key)
+        _, top, bottom = analytics_report(app.students, key)
+        values = StudentAnalytics(app.students).values(key)
+        check(failures, top == sorted(range(len(values)), key=lambda row: -values[row])[:10] and
+              bottom == sorted(range(len(values)), key=values.__getitem__)[:10], f"student.analytics.{key}: wrong ranking")
+    yield "student.analytics.ranks", lambda: StudentAnalytics(app.students).percentile_ranks()
+    #One mark edit followed by the queries it invalidates, as the aggregates keep them current.
+    yield "student.update_marks", lambda: (app.students.update_marks(last, 20, 20, 20, 100), app.students.highest(),
+                                           analytics_report(app.students, "total"))
+    check(failures, consistent_aggregates(app.students) is not None, "student.update_marks: stale aggregates")
+
+    jokes_csv = write_joke_csv(os.path.join(workdir, "jokes.csv"), size)
+    yield "jokes.load.csv", lambda: (remove_file(jokes_csv + PREPROCESSED_SUFFIX), load_and_prepare_jokes(jokes_csv))
+    remove_file(jokes_csv + PREPROCESSED_SUFFIX)
+    indexed = list(load_and_prepare_jokes(jokes_csv)) #Leave the preprocessed corpus in place...
+    check(failures, indexed == csv_jokes(jokes_csv), "jokes.load.csv: differs from reading the CSV")
+    yield "jokes.load.preprocessed", lambda: load_and_prepare_jokes(jokes_csv) #...then time opening it.
+    check(failures, list(load_and_prepare_jokes(jokes_csv)) == indexed, "jokes.load.preprocessed: differs from the CSV index")
+    sampler = IndexedSampler(load_and_prepare_jokes(jokes_csv), no_repeat=True, rng=random.Random(0))
+    yield f"jokes.draw.x{DRAWS}", lambda: [sampler.draw() for _ in range(DRAWS)] #What tellJoke does per click.
+
+    generator = ProblemGenerator(seed=0)
+    yield "quiz.generate", lambda: generator.generate(size, 2)
+    stream = make_answer_stream(size * 2) #Enough answers for every second try.
+    yield "quiz.check_answers", lambda: play_answer_stream(size, stream)
+    log_path, quizzes = os.path.join(workdir, "quiz_events.log"), max(1, size // 100)
+    logged = record_quizzes(log_path, quizzes)
+    yield "quiz.replay", lambda: replay(log_path)
+    result = replay(log_path)
+    check(failures, (result["sessions"], result["answers"], result["mismatches"]) == (quizzes, logged, 0),
+          f"quiz.replay: {result['sessions']}/{quizzes} sessions, {result['answers']}/{logged} answers, "
+          f"{result['mismatches']} mismatch(es)")
+
+
+def load_baseline(file_path): #Return saved {case@size: ms} timings, or {} if there is no baseline yet.
+    try:
+        with open(file_path) as file:
+            return json.load(file)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def bench_suite(size, baseline_file=BASELINE_FILE, save=False, tolerance=TOLERANCE): #Time and check every case; returns
+    baseline = load_baseline(baseline_file) #regressions and failed checks.
+    results, regressions, failures = {}, [], []
+    repeat = 5 if size <= 100000 else 3 #Large inputs take seconds per call, but one run is too noisy to compare.
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, func in suite_cases(size, workdir, failures):
+            key = f"{name}@{size}"
+            results[key] = elapsed = time_call(func, repeat)
+            previous = baseline.get(key)
+            if previous is None: #Nothing to compare against yet.
+                verdict = "new"
+            else:
+                change = elapsed / previous - 1 if previous else 0.0
+                verdict = f"{change:+.0%}"
+                if change > tolerance: #Slower than the baseline allows.
+                    verdict += "  REGRESSION"
+                    regressions.append(key)
+            print(f"{name:<28} n={size:<9} {elapsed:12.3f} ms   {verdict}")
+    if save: #Merge into the baseline so other sizes are kept.
+        baseline.update(results)
+        with open(baseline_file, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": baseline},
+                      file, indent=2, sort_keys=True)
+    for failure in failures: #Wrong results matter more than timings.
+        print(f"FAILED {failure} (n={size})")
+    return regressions + [f"{failure} (n={size})" for failure in failures]
+
+
+BENCHMARKS = {"search": bench_search, "sessions": bench_sessions, "replay": bench_replay,
+              "suite": bench_suite} #Benchmarks selectable from the command line.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the portfolio programs' hot paths.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS), help="which benchmark to run")
+    parser.add_argument("--size", type=lambda value: int(float(value)), nargs="+", default=[100000],
+                        help="number of synthetic records; several sizes (e.g. 1e3 1e5 1e7) run one after another")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="suite: JSON file of baseline timings to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="suite: record these timings as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="suite: slowdown fraction flagged as a regression")
+    args = parser.parse_args()
+    regressions = []
+    for size in args.size:
+        if args.benchmark == "suite":
+            regressions += bench_suite(size, args.baseline, args.save_baseline, args.tolerance)
+        else:
+            BENCHMARKS[args.benchmark](size)
+    if regressions: #Non-zero exit so CI can fail on a slowdown or a wrong result.
+        print(f"{len(regressions)} regression(s) or failed check(s): {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
@@ -1,24 +1,312 @@
-import pandas as pd #Import pandas to read and process the CSV file.
+import csv #Import csv to decode individual joke records.
+import hashlib #Import hashlib to fingerprint the CSV for the preprocessed corpus.
+import io #Import io to feed a single record to the csv reader.
+import mmap #Import mmap to read the preprocessed corpus without loading it.
+import os #Import os to read the CSV size for the progress indicator.
+import queue #Import queue to hand loaded jokes from the worker thread to the GUI.
 import random #Import random to select a joke randomly from the list.
+import struct #Import struct to write the preprocessed corpus format.
+import threading #Import threading to load the CSV without blocking the window.
+import time #Import time to measure time-to-first-joke.
+from array import array #Import array to store joke offsets compactly.
 from tkinter import * #Import all components from Tkinter for GUI creation.
 
-JOKES = [] #Global list to store (setup, punchline) tuples.
+from instrumentation import timed, widget_update #Import the timing hooks (no-ops unless PERF_TRACE is set).
+
+JOKES = [] #Global sequence of (setup, punchline) tuples, filled batch by batch by the loader thread.
 CURRENT_PUNCHLINE = "" #Global variable to store the punchline of the current joke.
 STATE = "SETUP" #Global state: Tracks if the next action should reveal the punchline.
 CSV_FILE = 'shortjokes.csv' #Defines the name of the new dataset file.
+FIRST_BATCH_SIZE = 50 #Jokes in the first batch, kept small so the button unlocks quickly.
+BATCH_SIZE = 5000 #Jokes per batch after the first.
+POLL_MS = 50 #How often the GUI checks the loader queue, in milliseconds.
+LOAD_STARTED = time.perf_counter() #Program start, for the time-to-first-joke metric.
+
+def iter_csv_records(file, offset=0, digest=None): #Yield (byte offset, raw bytes) for each CSV record, starting at offset.
+    file.seek(offset) #Start reading at the requested record.
+    record = b"" #Bytes of the record being assembled.
+    for line in (file if digest is None else iter_hashed_lines(file, digest)): #Quoted fields may contain newlines, so a record can span several lines.
+        if not record: #A new record starts on this line.
+            start = offset
+        record += line
+        offset += len(line)
+        if record.count(b'"') % 2 == 0: #Balanced quotes: the record is complete.
+            yield start, record
+            record = b""
+    if record: #Unterminated last record.
+        yield start, record
+
+def iter_hashed_lines(file, digest): #Yield a binary file's lines, feeding each one to digest on the way.
+    for line in file:
+        digest.update(line)
+        yield line
+
+def decode_record(record): #Split one raw CSV record into its fields.
+    return next(csv.reader(io.StringIO(record.decode('utf-8', errors='replace'))), [])
+
+def split_joke(joke): #Split a joke on its first '?' into a (setup, punchline) tuple.
+    setup, _, punchline = joke.partition('?') #One split per joke.
+    return setup.strip(), punchline.strip().replace('\n', ' ')
+
+class JokeIndex: #Byte offsets of question-style jokes in the CSV; each joke is read only when picked.
+
+    def __init__(self, file_path, joke_column): #Create an empty index over a CSV file.
+        self.file_path = file_path #CSV file the offsets point into.
+        self.joke_column = joke_column #Position of the 'Joke' column in each record.
+        self.offsets = array('Q') #Start offset of every question-style joke record.
+
+    def __len__(self): #Number of indexed jokes.
+        return len(self.offsets)
+
+    def __getitem__(self, i): #Seek to one joke and decode just that record.
+        with open(self.file_path, 'rb') as file:
+            _, record = next(iter_csv_records(file, self.offsets[i]))
+        return split_joke(decode_record(record)[self.joke_column])
+
+def iter_question_jokes(file, digest=None): #Yield (offset, joke column, fields) for every record whose 'Joke' contains a '?'.
+    records = iter_csv_records(file, digest=digest) #digest, if given, is fed every byte read.
+    _, header = next(records) #The first record holds the column names.
+    joke_column = decode_record(header).index('Joke') #Find the 'Joke' column.
+    for offset, record in records: #Keep rows whose 'Joke' column contains a '?'.
+        if b'?' not in record: #Cheap byte check skips most non-question jokes without decoding.
+            continue
+        fields = decode_record(record)
+        if len(fields) > joke_column and '?' in fields[joke_column]:
+            yield offset, joke_column, fields
+
+PREPROCESSED_SUFFIX = '.jokes' #Suffix of the preprocessed corpus written next to the CSV.
+PREPROCESSED_MAGIC = b'JOKEPRE1' #Identifies a preprocessed corpus file and its format version.
+#Header: magic, SHA-256 of the CSV, CSV size, CSV mtime (ns), joke count, offset of the record table.
+PREPROCESSED_HEADER = struct.Struct('<8s32sQqQQ')
+LENGTH_PREFIX = struct.Struct('<I') #Byte length written before each setup and punchline.
+
+def file_sha256(file_path): #Content hash of a file, read in 1 MiB blocks.
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+class PreprocessedJokes: #(setup, punchline) pairs read straight from a memory-mapped preprocessed corpus.
+
+    def __init__(self, mapped, count, table_offset): #Wrap an mmap of a preprocessed corpus file.
+        self.mapped = mapped #Keeps the mapping alive.
+        self.offsets = memoryview(mapped)[table_offset:table_offset + 8 * count].cast('Q') #Record start offsets.
+
+    def __len__(self): #Number of jokes in the corpus.
+        return len(self.offsets)
+
+    def __getitem__(self, i): #Decode one length-prefixed (setup, punchline) record.
+        position = self.offsets[i]
+        pair = []
+        for _ in range(2): #Setup, then punchline.
+            (length,) = LENGTH_PREFIX.unpack_from(self.mapped, position)
+            position += LENGTH_PREFIX.size
+            pair.append(self.mapped[position:position + length].decode('utf-8'))
+            position += length
+        return tuple(pair)
+
+class PreprocessedJokesWriter: #Writes (setup, punchline) pairs to a preprocessed corpus file.
+
+    def __init__(self, file_path): #Start a new corpus beside the final path.
+        self.file_path = file_path #Final location of the corpus.
+        self.temp_path = file_path + '.tmp' #Written here first so readers never see a partial file.
+        self.file = open(self.temp_path, 'wb')
+        self.file.write(bytes(PREPROCESSED_HEADER.size)) #Placeholder, filled in by finish().
+        self.offsets = array('Q') #Start offset of each record.
+
+    def add(self, setup, punchline): #Append one record.
+        self.offsets.append(self.file.tell())
+        for text in (setup, punchline):
+            data = text.encode('utf-8')
+            self.file.write(LENGTH_PREFIX.pack(len(data)))
+            self.file.write(data)
+
+    def finish(self, source_stat, digest): #Write the record table and header, then move the file into place.
+        table_offset = self.file.tell()
+        self.file.write(self.offsets)
+        self.file.seek(0)
+        self.file.write(PREPROCESSED_HEADER.pack(PREPROCESSED_MAGIC, digest, source_stat.st_size,
+                                                 source_stat.st_mtime_ns, len(self.offsets), table_offset))
+        self.file.close()
+        os.replace(self.temp_path, self.file_path)
 
-def load_and_prepare_jokes(file_path): #Function to load and parse jokes from the CSV.
+    def discard(self): #Abandon a partial corpus; never raises, since the corpus is only a cache.
+        try:
+            self.file.close() #Flushing can fail again on a full disk.
+        except OSError:
+            pass
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+def open_preprocessed_jokes(file_path): #Return the CSV's preprocessed corpus, or None if it is missing or stale.
+    try:
+        source_stat = os.stat(file_path)
+        with open(file_path + PREPROCESSED_SUFFIX, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, digest, size, mtime_ns, count, table_offset = PREPROCESSED_HEADER.unpack_from(mapped)
+    except (OSError, ValueError, struct.error): #Missing, empty or truncated corpus file.
+        return None
+    if magic != PREPROCESSED_MAGIC or size != source_stat.st_size: #Wrong format or the CSV changed size.
+        return None
+    if mtime_ns != source_stat.st_mtime_ns: #Touched: compare contents before trusting the corpus.
+        if digest != file_sha256(file_path): #Really changed.
+            return None
+        try: #Same contents: record the new mtime so later launches skip the hash.
+            with open(file_path + PREPROCESSED_SUFFIX, 'r+b') as file:
+                file.write(PREPROCESSED_HEADER.pack(magic, digest, size, source_stat.st_mtime_ns, count, table_offset))
+        except OSError: #E.g. a read-only directory; the next launch just hashes again.
+            pass
+    if table_offset + 8 * count > len(mapped): #Truncated corpus file.
+        return None
+    return PreprocessedJokes(mapped, count, table_offset)
+
+def scan_jokes(file_path, on_batch): #Stream the CSV once, passing offset batches to on_batch and writing the preprocessed corpus.
+    source_stat = os.stat(file_path) #Recorded in the corpus header so later launches can check it.
+    digest = hashlib.sha256() #Fed from the streaming pass, so no separate read delays the first batch.
+    try:
+        writer = PreprocessedJokesWriter(file_path + PREPROCESSED_SUFFIX)
+    except OSError: #E.g. a read-only directory: index the CSV without preprocessing it.
+        writer = None
+    try:
+        with open(file_path, 'rb') as file: #Stream the file once in binary so offsets are exact.
+            batch, batch_size = array('Q'), FIRST_BATCH_SIZE
+            for offset, joke_column, fields in iter_question_jokes(file, digest):
+                if writer is not None: #Split each joke once, here, instead of on every launch.
+                    try:
+                        writer.add(*split_joke(fields[joke_column]))
+                    except OSError: #E.g. disk full: keep indexing the CSV without the corpus.
+                        writer.discard()
+                        writer = None
+                batch.append(offset)
+                if len(batch) >= batch_size: #Hand a full batch over.
+                    on_batch(joke_column, batch, offset / source_stat.st_size)
+                    batch, batch_size = array('Q'), BATCH_SIZE
+            if batch: #Hand over whatever is left.
+                on_batch(joke_column, batch, 1.0)
+    except BaseException:
+        if writer is not None:
+            writer.discard()
+        raise
+    if writer is not None:
+        try:
+            writer.finish(source_stat, digest.digest())
+        except OSError: #The offsets were already handed over, so the load still succeeds.
+            writer.discard()
+
+def load_and_prepare_jokes(file_path): #Function to load the question-style jokes, preprocessing the CSV if needed.
     try: #Begin exception handling block.
-        df = pd.read_csv(file_path) #Read the CSV file into a DataFrame.
-        #Filter the DataFrame: selects rows where the 'Joke' column contains a '?'.
-        df_filtered = df[df['Joke'].str.contains(r'\?', na=False)] 
-        
-        #Return a list of (setup, punchline) tuples using a list comprehension.
-        return [(joke.split('?', 1)[0].strip(), joke.split('?', 1)[1].strip().replace('\n', ' ')) 
-                for joke in df_filtered['Joke']] #Split each joke on the first '?'.
+        jokes = open_preprocessed_jokes(file_path) #Fast path: the CSV is unchanged since it was preprocessed.
+        if jokes is None: #Build the corpus, keeping a CSV offset index in case it can't be written.
+            index = []
+            def collect(joke_column, batch, progress):
+                nonlocal index
+                if not index: #Create the index once the 'Joke' column is known.
+                    index = JokeIndex(file_path, joke_column)
+                index.offsets.extend(batch)
+            scan_jokes(file_path, collect)
+            jokes = open_preprocessed_jokes(file_path) or index
+        return jokes if len(jokes) else [] #No question jokes: behave like an empty list.
     except: #Catch any errors (e.g., file not found, wrong column name).
         return [] #Return an empty list if loading fails.
 
+def load_jokes_in_background(file_path, out_queue): #Worker thread: load the corpus and post it to out_queue.
+    try:
+        jokes = open_preprocessed_jokes(file_path) #Fast path: hand the whole preprocessed corpus over at once.
+        if jokes is not None:
+            out_queue.put(("corpus", None, jokes, 1.0))
+        else: #Otherwise stream the CSV, posting offset batches as they are found.
+            scan_jokes(file_path, lambda joke_column, batch, progress:
+                       out_queue.put(("batch", joke_column, batch, progress)))
+        out_queue.put(("done", None, None, 1.0))
+    except Exception as e: #Report any failure (e.g., file not found) to the GUI instead of dying silently.
+        out_queue.put(("error", None, str(e), 1.0))
+
+class ShuffledOrder: #Visits 0..n-1 once each in a random order, using a keyed Feistel network instead of a shuffled list.
+    ROUNDS = 4 #Feistel rounds; four give a well-mixed permutation.
+
+    def __init__(self, n, rng=random): #Pick fresh keys for a new permutation of range(n).
+        self.n = n #Size of the range being permuted.
+        bits = max(2, (n - 1).bit_length()) #Smallest even bit width covering n...
+        bits += bits % 2 #...so the value splits into two equal halves.
+        self.half_bits = bits // 2
+        self.mask = (1 << self.half_bits) - 1
+        self.keys = [rng.getrandbits(32) for _ in range(self.ROUNDS)] #The permutation is defined by these keys alone.
+        self.counter = 0 #Next input to permute.
+        self.drawn = 0 #Values handed out so far.
+
+    def _permute(self, value): #Bijection on [0, 2**bits) built from Feistel rounds.
+        left, right = value >> self.half_bits, value & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (hash((right, key)) & self.mask)
+        return (left << self.half_bits) | right
+
+    def __iter__(self):
+        return self
+
+    def __next__(self): #Return the next position, skipping outputs outside range(n) (cycle walking).
+        if self.drawn >= self.n: #Every position has been visited.
+            raise StopIteration
+        while True: #The domain is under 4n wide, so this loops fewer than four times on average.
+            value = self._permute(self.counter)
+            self.counter += 1
+            if value < self.n:
+                self.drawn += 1
+                return value
+
+class IndexedSampler: #Draws jokes by random access into an indexed corpus.
+
+    def __init__(self, jokes, no_repeat=False, rng=random): #Sample from any sequence of (setup, punchline) tuples.
+        self.jokes = jokes #Indexed corpus, e.g. a JokeIndex.
+        self.no_repeat = no_repeat #Whether to avoid repeats until every joke has been told.
+        self.rng = rng #Random source, injectable for reproducible sessions.
+        self.order = None #Current no-repeat permutation.
+        self.base = 0 #First position the current permutation covers.
+
+    def draw(self): #Return one (setup, punchline), or None if the corpus is empty.
+        size = len(self.jokes)
+        if not size: #Nothing to draw from.
+            return None
+        if not self.no_repeat: #Plain random access: O(1) per draw.
+            return self.jokes[self.rng.randrange(size)]
+        if self.order is None or self.base + self.order.n > size: #First draw, or the corpus shrank: start over.
+            self.base, self.order = 0, ShuffledOrder(size, self.rng)
+        try:
+            position = next(self.order)
+        except StopIteration: #This permutation is used up.
+            covered = self.base + self.order.n
+            if covered < size: #The corpus grew meanwhile: cover just the new jokes before repeating any.
+                self.base, self.order = covered, ShuffledOrder(size - covered, self.rng)
+            else: #Everything has been told once: start a new round.
+                self.base, self.order = 0, ShuffledOrder(size, self.rng)
+            position = next(self.order)
+        return self.jokes[self.base + position]
+
+class ReservoirSampler: #Draws jokes uniformly in one pass over the CSV without indexing it.
+
+    def __init__(self, file_path, rng=random): #Sample straight from a CSV file.
+        self.file_path = file_path #CSV file to stream.
+        self.rng = rng #Random source, injectable for reproducible draws.
+
+    def sample(self, k): #Return up to k (setup, punchline) tuples chosen uniformly (Algorithm R).
+        reservoir = [] #At most k jokes are ever held.
+        with open(self.file_path, 'rb') as file:
+            for seen, (_, joke_column, fields) in enumerate(iter_question_jokes(file)):
+                if seen < k: #Fill the reservoir first.
+                    reservoir.append(fields[joke_column])
+                else: #Then replace entries with decreasing probability.
+                    slot = self.rng.randrange(seen + 1)
+                    if slot < k:
+                        reservoir[slot] = fields[joke_column]
+        return [split_joke(joke) for joke in reservoir] #Split only the chosen jokes.
+
+    def draw(self): #Return one (setup, punchline), or None if the file has no question jokes.
+        jokes = self.sample(1)
+        return jokes[0] if jokes else None
+
+@timed()
 def tellJoke(): #Function to select and display a new joke's setup.
     global CURRENT_PUNCHLINE, STATE #Declare global variables for modification.
     
@@ -26,11 +314,13 @@ def tellJoke(): #Function to select and display a new joke's setup.
         joke_label.config(text="No jokes loaded.") #Display error message in the GUI.
         return #Exit the function if no jokes are available.
 
-    setup, punchline = random.choice(JOKES) #Select a random joke (setup and punchline).
+    setup, punchline = SAMPLER.draw() #Select a random joke not yet told this session.
     CURRENT_PUNCHLINE = punchline #Store the punchline globally.
     STATE = "PUNCHLINE" #Change state to indicate punchline is ready to be shown.
     
-    joke_label.config(text=f"Setup: {setup}?") #Update the label to display the joke setup.
+    text = f"Setup: {setup}?"
+    joke_label.config(text=text) #Update the label to display the joke setup.
+    widget_update("joke_label", len(text))
     tell_button.config(state=DISABLED) #Disable the "Tell me a Joke" button.
     punchline_button.config(state=NORMAL) #Enable the "Show Punchline" button.
 
@@ -46,23 +336,63 @@ def showPunchline(): #Function to reveal the punchline and reset the state.
     tell_button.config(state=NORMAL) #Enable the "Tell me a Joke" button.
     STATE = "SETUP" #Reset state to allow a new joke request.
 
-root = Tk() #Create the main Tkinter window (root object).
-root.title("Jokes When Sad") #Set the title of the window.
+def pollJokeLoader(): #Move loaded batches from the worker thread into JOKES, then poll again.
+    global JOKES, FIRST_JOKE_MS #Declare global variables for modification.
+    while True: #Drain everything queued since the last poll.
+        try:
+            kind, joke_column, payload, progress = LOADER_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        if kind in ("batch", "corpus"): #More jokes are available.
+            if not JOKES: #First jokes: create the corpus and unlock the button.
+                JOKES = SAMPLER.jokes = payload if kind == "corpus" else JokeIndex(CSV_FILE, joke_column)
+                FIRST_JOKE_MS = (time.perf_counter() - LOAD_STARTED) * 1000
+                print(f"Time to first joke: {FIRST_JOKE_MS:.1f} ms")
+                if STATE == "SETUP": #Don't interrupt a joke waiting for its punchline.
+                    tell_button.config(state=NORMAL)
+            if kind == "batch": #Offsets into the CSV found so far.
+                JOKES.offsets.extend(payload)
+            progress_label.config(text=f"Loading jokes... {progress:.0%} ({len(JOKES)} ready)")
+        elif kind == "done" and JOKES: #Loading finished.
+            seconds = time.perf_counter() - LOAD_STARTED
+            progress_label.config(text=f"Loaded {len(JOKES)} jokes in {seconds:.2f} s, first joke after {FIRST_JOKE_MS:.0f} ms.")
+            return #Stop polling.
+        elif kind == "error": #Loading failed: show the worker's message.
+            progress_label.config(text=f"Could not load jokes: {payload}")
+            tell_button.config(state=NORMAL) #tellJoke reports the empty list.
+            return #Stop polling.
+        else: #The file had no question jokes.
+            progress_label.config(text="No jokes loaded.")
+            tell_button.config(state=NORMAL) #tellJoke reports the empty list.
+            return #Stop polling.
+    root.after(POLL_MS, pollJokeLoader) #Check again shortly.
+
+SAMPLER = IndexedSampler(JOKES, no_repeat=True) #Draw jokes without repeats for the interactive session.
+FIRST_JOKE_MS = None #Milliseconds from start until the first joke could be told.
+LOADER_QUEUE = queue.Queue() #Thread-safe hand-off from the loader thread to the GUI.
+
+if __name__ == "__main__": #Only start the GUI when run directly, so the module can be imported.
+    root = Tk() #Create the main Tkinter window (root object).
+    root.title("Jokes When Sad") #Set the title of the window.
+
+    joke_label = Label(root, text="Say 'Alexa tell me a Joke' or press the button below.", #Create label for joke text/instructions.
+                       font=("Arial", 12), wraplength=400, justify=LEFT) #Set font, wrap length, and left justification.
+    joke_label.pack(padx=20, pady=20) #Place the label in the window with padding.
 
-JOKES = load_and_prepare_jokes(CSV_FILE) #Load the jokes dataset on program startup.
+    tell_button = Button(root, text="Alexa tell me a Joke", command=tellJoke, #Create the "Tell Joke" button.
+                         font=("Arial", 14, "bold"), state=DISABLED) #Set the button's font; enabled once jokes arrive.
+    tell_button.pack(fill='x', padx=20, pady=5) #Place the button and stretch it horizontally.
 
-joke_label = Label(root, text="Say 'Alexa tell me a Joke' or press the button below.", #Create label for joke text/instructions.
-                   font=("Arial", 12), wraplength=400, justify=LEFT) #Set font, wrap length, and left justification.
-joke_label.pack(padx=20, pady=20) #Place the label in the window with padding.
+    punchline_button = Button(root, text="Show Punchline", command=showPunchline, #Create the "Show Punchline" button.
+                              font=("Arial", 14), state=DISABLED) #Set font and disable it initially.
+    punchline_button.pack(fill='x', padx=20, pady=5) #Place the button and stretch it horizontally.
 
-tell_button = Button(root, text="Alexa tell me a Joke", command=tellJoke, #Create the "Tell Joke" button.
-                     font=("Arial", 14, "bold")) #Set the button's font.
-tell_button.pack(fill='x', padx=20, pady=5) #Place the button and stretch it horizontally.
+    Button(root, text="Quit", command=root.quit).pack(fill='x', padx=20, pady=5) #Create and place the 'Quit' button.
 
-punchline_button = Button(root, text="Show Punchline", command=showPunchline, #Create the "Show Punchline" button.
-                          font=("Arial", 14), state=DISABLED) #Set font and disable it initially.
-punchline_button.pack(fill='x', padx=20, pady=5) #Place the button and stretch it horizontally.
+    progress_label = Label(root, text="Loading jokes...", font=("Arial", 10), fg="grey") #Loading progress indicator.
+    progress_label.pack(padx=20, pady=(0, 10)) #Place it under the buttons.
 
-Button(root, text="Quit", command=root.quit).pack(fill='x', padx=20, pady=5) #Create and place the 'Quit' button.
+    threading.Thread(target=load_jokes_in_background, args=(CSV_FILE, LOADER_QUEUE), daemon=True).start() #Load off the GUI thread.
+    root.after(POLL_MS, pollJokeLoader) #Start polling for loaded jokes.
 
-root.mainloop()
\ No newline at end of file
+    root.mainloop()
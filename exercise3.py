@@ -1,37 +1,14 @@
 from tkinter import * #Import all names from tkinter directly  
 
-class Student: #Define a class to hold and calculate student data.
-    MAX_COURSEWORK = 60 #Define max mark for three coursework components
-    MAX_EXAM = 100 #Define max mark for the examination.
-    MAX_TOTAL = 160 #Define max overall possible mark 
-
-    def __init__(self, code, name, m1, m2, m3, exam): #Initialize a student object.
-        self.code = code #Store student code 
-        self.name = name #Store student name 
-        self.coursework_marks = [m1, m2, m3] #Store individual coursework marks.
-        self.exam_mark = exam #Store examination mark.
-        self.total_coursework = sum(self.coursework_marks) #Calculate total coursework mark (out of 60).
-        self.total_score = self.total_coursework + self.exam_mark #Calculate total overall score (out of 160).
-        self.percentage = (self.total_score / self.MAX_TOTAL) * 100 #Calculate overall percentage.
-        self.grade = self._calculate_grade() #Determine the student's grade.
-
-    def _calculate_grade(self): #Internal method to determine the letter grade.
-        if self.percentage >= 70: return 'A' #A for 70%+.
-        elif self.percentage >= 60: return 'B' #B for 60-69%.
-        elif self.percentage >= 50: return 'C' #C for 50-59%.
-        elif self.percentage >= 40: return 'D' #D for 40-49%.
-        else: return 'F' #F for under 40%.
-
-    def get_display_info(self): #Formats student data into a display string.
-        return ( #Return a formatted multiline string.
-            f"Name: {self.name}\n" #Student Name.
-            f"Code: {self.code}\n" #Student Number.
-            f"Total Coursework Mark: {self.total_coursework} / {self.MAX_COURSEWORK}\n" #Total Coursework Mark.
-            f"Exam Mark: {self.exam_mark} / {self.MAX_EXAM}\n" #Exam Mark.
-            f"Overall Percentage: {self.percentage:.2f}%\n" #Overall Percentage (2 decimal places).
-            f"Student Grade: {self.grade}\n" #Final Grade.
-        )
+from instrumentation import phase, timed, widget_update #Import the timing hooks (no-ops unless PERF_TRACE is set).
+from student_analytics import MAX_SCORE, SCORE_KEYS, StudentAnalytics #Import the grade-distribution and ranking engine.
+from student_store import DATA_FILE, StudentTable, iter_load_table #Import the columnar student store.
 
+SEARCH_DISPLAY_LIMIT = 50 #Maximum number of matching records shown for one search.
+RECORDS_PAGE_SIZE = 100 #Number of records formatted and inserted per page in View All.
+RECORDS_WINDOW_PAGES = 4 #Pages View All keeps in the widget; pages scrolled further away are dropped.
+RANKING_SIZE = 10 #Number of students listed by Top/Bottom.
+INDEX_CHUNK_SIZE = 1000 #Names added to the search index per event-loop turn once the file is loaded.
 
 
 class StudentDataApp: #Main application class.
@@ -40,52 +17,87 @@ class StudentDataApp: #Main application class.
         self.master = master #Store the root Tk window.
         master.title("Student Data Manager") #Set the window title.
 
-        self.students = self._load_data() #Load and parse the student data.
-        self.total_students = len(self.students) #Store the total number of students.
+        self.students = StudentTable() #Columnar student store, filled progressively while the file loads.
+        self.total_students = 0 #Store the total number of students.
+        self.load_errors = [] #(line number, message) pairs for lines that failed to parse.
+        self._analytics = None #StudentAnalytics over self.students, created on first use.
 
         self.create_menu(master) #Create the menu buttons and search area.
         self.create_output_area(master) #Create the text area for output.
-        
-        #Display initial loading message based on success/failure
-        if self.total_students == 0: #Check if data loading failed
-            self.output.insert(END, "\n--- ERROR ---\nCould not load data from studentMarks.txt. File may be missing or empty.")
-        else:
-            self.output.insert(END, f"\nLoaded {self.total_students} student records successfully.")
 
+        self._start_progressive_load() #Begin filling the table through after() callbacks.
 
-    def _load_data(self): #Function to read and parse from the external file.
-        students_list = [] #Initialize an empty list for Student objects.
-        file_path = "studentMarks.txt" #Define the name of the file to read.
-        
-        try: #Attempt to open and read the file content.
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
+    def _report_load_error(self, line_number, message): #Record and log one line that failed to parse.
+        self.load_errors.append((line_number, message)) #Keep the error for later display.
+        print(f"Line {line_number}: {message}") #Log the problem to the console.
+
+    def _start_progressive_load(self, file_path=DATA_FILE): #Start loading the file in chunks on the Tk event loop.
+        self._load_file_path = file_path #Remember which file is being loaded.
+        self._loader = iter_load_table(file_path, on_error=self._report_load_error) #Opens the file on the first step.
+        self.output.insert(END, f"\nLoading {file_path}...") #Show a loading message.
+        self.master.after(0, self._load_next_chunk) #Schedule the first chunk.
+
+    def reload_data(self): #Handler for the Reload button: re-read the file into a fresh table.
+        if self._loader is not None: #Ignore clicks while a load is still running.
+            return
+        self.students = StudentTable() #A fresh table starts with fresh aggregates.
+        self.total_students = 0 #Reset the count.
+        self.load_errors = [] #Forget errors from the previous load.
+        self.clear_output("Reloading") #Clear screen.
+        self._start_progressive_load(self._load_file_path) #Load the file again.
+
+    def _load_next_chunk(self): #Load one chunk (or the snapshot) and reschedule until the file is done.
+        try:
+            self.students, from_snapshot = next(self._loader) #Parse and store the next chunk of lines.
+        except StopIteration: #All chunks have been stored (and the snapshot written).
+            self._finish_progressive_load()
+            return
         except FileNotFoundError: #Handle case where file is missing.
-            print(f"Error: File '{file_path}' not found.")
-            return students_list #Return empty list on failure.
-
-        #Process the lines (skipping the first line which is the count)
-        for line in lines[1:]: #Loop through data lines, ignoring the first line (count).
-            line = line.strip() #Clean up whitespace.
-            if not line: #Skip empty lines.
-                continue
-            try:
-                parts = [p.strip() for p in line.split(',')] #Split by comma.
-                code = int(parts[0]) #Student code.
-                name = parts[1] #Student name.
-                #Ensure we have 4 marks (m1, m2, m3, exam)
-                if len(parts) >= 6: #Check for the correct number of fields.
-                    marks = [int(m) for m in parts[2:]] #Marks list.
-                    students_list.append(Student(code, name, marks[0], marks[1], marks[2], marks[3])) #Create Student object.
-                else:
-                    print(f"Warning: Skipping line due to insufficient data: {line}") #Log warning for malformed line.
-            except ValueError: #Handle cases where marks or code are not integers.
-                print(f"Warning: Skipping line due to data format error: {line}")
-            except Exception as e: #Catch any other unexpected errors.
-                print(f"An unexpected error occurred while processing line: {line}. Error: {e}")
-                continue
-                
-        return students_list #Return the list of Student objects.
+            print(f"Error: File '{self._load_file_path}' not found.")
+            self._finish_progressive_load()
+            return
+        except (OSError, ValueError) as e: #Unreadable file, or rows the table rejects; keep what was stored.
+            print(f"Error: Could not load '{self._load_file_path}': {e}")
+            self._finish_progressive_load()
+            return
+        self.total_students = len(self.students) #Update the total number of students.
+        if from_snapshot: #Snapshot matches the file: no parsing needed.
+            self.output.insert(END, f"\nLoaded {self._load_file_path} from snapshot.")
+        else:
+            self._show_load_status(f"\nLoaded {self.total_students} records so far...") #Report progress.
+        self.master.after(1, self._load_next_chunk) #Yield to the event loop before the next chunk.
+
+    def _index_next_chunk(self, table): #Index one chunk of the loaded table per event-loop turn.
+        if table is not self.students: #A reload replaced the table and indexes its own.
+            return
+        with phase("load.index"):
+            codes_left = table.index_codes(INDEX_CHUNK_SIZE) #Only a snapshot load leaves codes to index.
+            names_left = table.index_names(INDEX_CHUNK_SIZE) #Searches scan the rows this hasn't reached yet.
+        if codes_left or names_left: #Reschedule until every row is indexed.
+            self.master.after(1, self._index_next_chunk, table)
+
+    def _show_load_status(self, text): #Rewrite the single progress line in place instead of adding one per chunk.
+        ranges = self.output.tag_ranges("load_status") #Where the previous progress line is, if still shown.
+        if ranges: #Replace it where it stands.
+            self.output.delete(*ranges)
+            self.output.insert(ranges[0], text, "load_status")
+        else: #First chunk, or the output was cleared meanwhile.
+            self.output.insert(END, text, "load_status")
+        self.output.see(END) #Scroll to the bottom.
+
+    def _finish_progressive_load(self): #Display the final loading message based on success/failure.
+        self._loader = None #Release the generator.
+        ranges = self.output.tag_ranges("load_status")
+        if ranges: #The final message below replaces the progress line.
+            self.output.delete(*ranges)
+        if self.total_students == 0: #Check if data loading failed
+            self.output.insert(END, f"\n--- ERROR ---\nCould not load data from {self._load_file_path}. File may be missing or empty.")
+        else:
+            self.output.insert(END, f"\nLoaded {self.total_students} student records successfully.")
+            self.master.after(1, self._index_next_chunk, self.students) #Build the name index in the background.
+        if self.load_errors: #Report how many lines were skipped.
+            self.output.insert(END, f"\nSkipped {len(self.load_errors)} line(s) with errors (see console).")
+        self.output.see(END) #Scroll to the bottom.
 
     def create_menu(self, master): #Creates the menu buttons and fixed entry box in two rows.
         
@@ -95,6 +107,17 @@ class StudentDataApp: #Main application class.
         Button(menu_frame, text="1. View All", command=self.view_all_records).pack(side=LEFT, padx=5) #View All button.
         Button(menu_frame, text="3. Highest Score", command=self.show_highest_score).pack(side=LEFT, padx=5) #Highest Score button.
         Button(menu_frame, text="4. Lowest Score", command=self.show_lowest_score).pack(side=LEFT, padx=5) #Lowest Score button.
+        Button(menu_frame, text="Reload", command=self.reload_data).pack(side=LEFT, padx=5) #Reload button.
+
+        analytics_frame = Frame(master) #Create a frame for the distribution and ranking buttons.
+        analytics_frame.pack(side=TOP, fill=X, padx=10, pady=(0, 5)) #Place it below the main buttons.
+
+        Button(analytics_frame, text="5. Grade Distribution", command=self.show_grade_distribution).pack(side=LEFT, padx=5)
+        Button(analytics_frame, text=f"6. Top {RANKING_SIZE}", command=self.show_top_students).pack(side=LEFT, padx=5)
+        Button(analytics_frame, text=f"7. Bottom {RANKING_SIZE}", command=self.show_bottom_students).pack(side=LEFT, padx=5)
+        Label(analytics_frame, text="by").pack(side=LEFT, padx=(5, 2)) #Label for the ranking key.
+        self.rank_key = StringVar(master, value=SCORE_KEYS[0]) #Score that Top/Bottom rank by.
+        OptionMenu(analytics_frame, self.rank_key, *SCORE_KEYS).pack(side=LEFT) #Ranking key selector.
         
        
         search_frame = Frame(master) #Create the second frame for search components.
@@ -107,11 +130,21 @@ class StudentDataApp: #Main application class.
         Button(search_frame, text="Search", command=self.view_individual_record).pack(side=LEFT, padx=5) #Search button.
     
     def create_output_area(self, master): #Creates the Text widget for results display.
-        self.output = Text(master, wrap=WORD, width=60, height=25, font=("Courier", 10)) #Create Text widget.
-        self.output.pack(padx=10, pady=10) #Place output area.
+        self._listing_total = None #Records in the active View All listing, None when no listing is shown.
+        self._window_first = self._window_last = 0 #Rows currently rendered in the listing's window.
+        self._page_pending = False #Whether a window shift is already scheduled.
+        output_frame = Frame(master) #Frame holding the text area and its scrollbar.
+        output_frame.pack(padx=10, pady=10) #Place output area.
+        self.scrollbar = Scrollbar(output_frame) #Scrollbar for the text area.
+        self.scrollbar.pack(side=RIGHT, fill=Y) #Place it on the right.
+        self.output = Text(output_frame, wrap=WORD, width=60, height=25, font=("Courier", 10), #Create Text widget.
+                           yscrollcommand=self._on_output_scroll) #Watch scrolling to render more records.
+        self.output.pack(side=LEFT) #Place the text area.
+        self.scrollbar.config(command=self._on_scrollbar) #Let the scrollbar move the text, or jump in a listing.
         self.output.insert(END, "Student Data Manager Loaded.") #Initial message.
 
     def clear_output(self, title): #Helper to clear output and set title.
+        self._listing_total = None #Stop any View All listing in progress.
         self.output.delete(1.0, END) #Delete all content.
         self.output.insert(END, f"--- {title} ---\n\n") #Insert the section title.
 
@@ -123,20 +156,100 @@ class StudentDataApp: #Main application class.
 
     
 
-    def view_all_records(self): #Handler for Option 1: View all student records.
+    @timed()
+    def view_all_records(self): #Handler for Option 1: View all student records through a window of pages.
         self.clear_output("All Student Records") #Clear screen.
-        total_percentage_sum = 0 #Initialize sum.
-        
-        for student in self.students: #Loop through every student.
-            self.output.insert(END, self.format_student_output(student)) #Output student details.
-            total_percentage_sum += student.percentage #Sum percentages.
-        
-        average_percentage = total_percentage_sum / self.total_students if self.total_students else 0 #Calculate average.
+        self._records_line = int(self.output.index("end-1c").split(".")[0]) #Line where the window starts.
+        average_percentage = self.students.average_percentage() #Average from the maintained aggregates.
 
-        self.output.insert(END, "\n--- Summary ---\n") #Summary header.
-        self.output.insert(END, f"Total Students in Class: {self.total_students}\n") #Total students count.
-        self.output.insert(END, f"Average Percentage Mark: {average_percentage:.2f}%\n") #Average percentage.
-        self.output.see(END) #Scroll to the bottom.
+        self.output.insert(END, "\n--- Summary ---\n" #Summary header.
+                                f"Total Students in Class: {self.total_students}\n" #Total students count.
+                                f"Average Percentage Mark: {average_percentage:.2f}%\n") #Average percentage.
+        self._listing_total = self.total_students #The listing is active from here on.
+        self._window_first = self._window_last = 0 #Nothing rendered yet.
+        self._show_records_at(0) #Render the first pages.
+
+    def _record_line(self, row): #Text line where a rendered row starts.
+        return self._records_line + (row - self._window_first) * self._lines_per_record
+
+    def _view_row(self, y): #Row shown at pixel height y of the text area, clamped to the rendered window.
+        line = int(self.output.index(f"@0,{y}").split(".")[0])
+        row = self._window_first + (line - self._records_line) // self._lines_per_record
+        return min(max(row, self._window_first), self._window_last - 1)
+
+    @timed()
+    def _insert_page(self, first, at_end): #Format one page of records and insert it at either end of the window.
+        last = min(first + RECORDS_PAGE_SIZE, self._listing_total) #Rows in this page.
+        page = "".join(self.format_student_output(self.students[row]) for row in range(first, last)) #One buffer per page.
+        self._lines_per_record = page.count("\n") // (last - first) #Every record has the same number of lines.
+        if at_end: #Below the window.
+            self.output.insert(f"{self._record_line(self._window_last)}.0", page) #One widget insert per page.
+            self._window_last = last
+        else: #Above the window.
+            self.output.insert(f"{self._records_line}.0", page)
+            self._window_first = first
+        widget_update("records_page", len(page))
+
+    def _remove_page(self, at_end): #Delete the page at either end of the window.
+        if at_end: #Drop the last page, which always starts on a page boundary.
+            first = self._window_last - 1 - (self._window_last - 1) % RECORDS_PAGE_SIZE
+            self.output.delete(f"{self._record_line(first)}.0", f"{self._record_line(self._window_last)}.0")
+            self._window_last = first
+        else: #Drop the first page.
+            last = self._window_first + RECORDS_PAGE_SIZE
+            self.output.delete(f"{self._records_line}.0", f"{self._record_line(last)}.0")
+            self._window_first = last
+
+    def _show_records_at(self, row): #Replace the window with the pages from row's page on, row at the top.
+        if not self._listing_total: #Nothing to list.
+            return
+        if self._window_last > self._window_first: #Delete the old window in one call.
+            self.output.delete(f"{self._records_line}.0", f"{self._record_line(self._window_last)}.0")
+        self._window_first = self._window_last = row - row % RECORDS_PAGE_SIZE
+        self._insert_page(self._window_first, at_end=True)
+        if self._window_last < self._listing_total: #A second page leaves room to scroll before the next shift.
+            self._insert_page(self._window_last, at_end=True)
+        self.output.yview(f"{self._record_line(row) if row else 1}.0") #Put the row (or the title) at the top.
+
+    def _shift_window(self, forward): #Add a page at one end of the window and drop one at the other if it's full.
+        self._page_pending = False #The scheduled shift is running.
+        if self._listing_total is None: #The listing was cleared meanwhile.
+            return
+        top_line = int(self.output.index("@0,0").split(".")[0]) #Keep this line at the top through the edit.
+        listing_line = top_line + self._window_first * self._lines_per_record #Independent of the window.
+        if forward and self._window_last < self._listing_total: #Scrolled near the bottom.
+            self._insert_page(self._window_last, at_end=True)
+            if self._window_last - self._window_first > RECORDS_WINDOW_PAGES * RECORDS_PAGE_SIZE:
+                self._remove_page(at_end=False)
+        elif not forward and self._window_first > 0: #Scrolled near the top.
+            self._insert_page(self._window_first - RECORDS_PAGE_SIZE, at_end=False)
+            if self._window_last - self._window_first > RECORDS_WINDOW_PAGES * RECORDS_PAGE_SIZE:
+                self._remove_page(at_end=True)
+        self.output.yview(f"{max(listing_line - self._window_first * self._lines_per_record, 1)}.0")
+
+    def _on_output_scroll(self, first, last): #Keep the scrollbar in sync and move the window near its ends.
+        if self._listing_total is None: #Ordinary text: the scrollbar follows the widget.
+            self.scrollbar.set(first, last)
+            return
+        if not self._page_pending: #Only one shift at a time.
+            if float(last) > 0.9 and self._window_last < self._listing_total:
+                self._page_pending = True
+                self.master.after_idle(self._shift_window, True) #Shift after the current event.
+            elif float(first) < 0.1 and self._window_first > 0:
+                self._page_pending = True
+                self.master.after_idle(self._shift_window, False)
+        if self._window_last > self._window_first: #The scrollbar spans the whole listing, not just the window.
+            bottom = self._view_row(self.output.winfo_height()) + 1
+            self.scrollbar.set(self._view_row(0) / self._listing_total, bottom / self._listing_total)
+        else:
+            self.scrollbar.set(first, last)
+
+    def _on_scrollbar(self, *args): #Scrollbar moved: dragging in a listing jumps to that record.
+        if self._listing_total and args[0] == "moveto": #A position along the whole listing.
+            fraction = min(max(float(args[1]), 0.0), 1.0)
+            self._show_records_at(min(int(fraction * self._listing_total), self._listing_total - 1))
+        else: #Arrows and page clicks scroll the text; the window follows through _on_output_scroll.
+            self.output.yview(*args)
 
     def view_individual_record(self): #Handler for Option 2: View individual student record.
         selection = self.search_entry.get() #Get value from the fixed entry box.
@@ -147,21 +260,30 @@ class StudentDataApp: #Main application class.
         else:
             self.output.insert(END, "\n--- Error ---\nPlease enter a Student Code or Name in the search box.\n") #Error if box is empty.
 
-    def _display_selected_student(self, selection): #Helper to find and display one student.
-        self.clear_output("Individual Student Record") #Clear screen.
-        selected_student = None #Initialize result.
-
+    def _find_students(self, selection): #Return (best rows, match count, whether the count is exact) by code or name.
         try: #1. Try to select by Student Code (int).
-            code = int(selection)
-            selected_student = next((s for s in self.students if s.code == code), None)
+            row = self.students.find_code(int(selection))
+            return ([], 0, True) if row is None else ([row], 1, True)
         except ValueError: #2. If not a number, try by Name (partial, case-insensitive).
-            name_lower = selection.lower()
-            selected_student = next((s for s in self.students if name_lower in s.name.lower()), None)
+            return self.students.search_name(selection, SEARCH_DISPLAY_LIMIT)
+
+    @timed()
+    def _display_selected_student(self, selection): #Helper to find and display matching students.
+        self.clear_output("Individual Student Record") #Clear screen.
+        rows, count, exact = self._find_students(selection) #Only the best SEARCH_DISPLAY_LIMIT rows come back.
+        about = "" if exact else "about " #The count is estimated for very common names or while indexing.
 
-        if selected_student: #If student is found.
-            self.output.insert(END, self.format_student_output(selected_student, include_separator=False))
+        if count == 1 and len(rows) == 1: #If exactly one student is found.
+            text = self.format_student_output(self.students[rows[0]], include_separator=False)
+        elif rows: #Several matches: list them best first.
+            text = f"{about.capitalize()}{count} students match '{selection}':\n\n" + "".join(
+                self.format_student_output(self.students[row]) for row in rows)
+            if count > len(rows): #Mention the matches that were not shown.
+                text += f"...and {about}{count - len(rows)} more. Refine the search to narrow it down.\n"
         else: #If not found.
-            self.output.insert(END, f"Error: Student '{selection}' not found by code or name.")
+            text = f"Error: Student '{selection}' not found by code or name."
+        self.output.insert(END, text) #One widget insert for the whole result.
+        widget_update("search_results", len(text))
         self.output.see(END) #Scroll to the bottom.
 
     def show_highest_score(self): #Handler for Option 3.
@@ -176,18 +298,64 @@ class StudentDataApp: #Main application class.
             self.output.insert(END, "No student data loaded.")
             return
 
-        key_func = lambda s: s.total_score #Define key for comparison (total score).
-        
-        if is_highest: #Find maximum score student.
-            student = max(self.students, key=key_func)
+        if is_highest: #Find maximum score student from the maintained aggregates.
+            student = self.students.highest()
             self.clear_output("Student with Highest Total Score")
-        else: #Find minimum score student.
-            student = min(self.students, key=key_func)
+        else: #Find minimum score student from the maintained aggregates.
+            student = self.students.lowest()
             self.clear_output("Student with Lowest Total Score")
 
         self.output.insert(END, self.format_student_output(student, include_separator=False))
         self.output.see(END) #Scroll to the bottom.
 
-root = Tk() #Create the main Tkinter window.
-app = StudentDataApp(root) #Initialize the application.
-root.mainloop() #Start the Tkinter event loop.
\ No newline at end of file
+    def _get_analytics(self): #Analytics over the current table, recreated when a reload swaps the table.
+        if self._analytics is None or self._analytics.table is not self.students:
+            self._analytics = StudentAnalytics(self.students)
+        return self._analytics
+
+    @timed()
+    def show_grade_distribution(self): #Handler for Option 5: grade histograms by total, coursework and exam.
+        if not self.students: #Check for empty data.
+            self.clear_output("No Data")
+            self.output.insert(END, "No student data loaded.")
+            return
+        analytics = self._get_analytics()
+        count = len(self.students)
+        self.clear_output("Grade Distribution")
+        lines = []
+        for key in SCORE_KEYS: #One histogram per score, graded on its own percentage.
+            lines.append(f"By {key} mark (out of {MAX_SCORE[key]}):")
+            for letter, n in analytics.grade_histogram(key).items():
+                share = n / count * 100
+                lines.append(f"  {letter}: {n:>8} {share:6.2f}% {'#' * round(share / 4)}") #Bar of one # per 4%.
+            lines.append("")
+        text = "\n".join(lines)
+        self.output.insert(END, text) #One widget insert for the whole report.
+        widget_update("grade_distribution", len(text))
+
+    def show_top_students(self): #Handler for Option 6.
+        self._show_ranking(highest=True)
+
+    def show_bottom_students(self): #Handler for Option 7.
+        self._show_ranking(highest=False)
+
+    @timed()
+    def _show_ranking(self, highest): #List the best or worst students by the selected score.
+        if not self.students: #Check for empty data.
+            self.clear_output("No Data")
+            self.output.insert(END, "No student data loaded.")
+            return
+        key = self.rank_key.get() #Score to rank by.
+        analytics = self._get_analytics()
+        rows = analytics.top_k(RANKING_SIZE, key) if highest else analytics.bottom_k(RANKING_SIZE, key)
+        self.clear_output(f"{'Top' if highest else 'Bottom'} {len(rows)} Students by {key.capitalize()} Mark")
+        text = "".join(f"#{place} (percentile rank by {key}: {analytics.percentile_rank(row, key):.2f})\n"
+                       + self.format_student_output(self.students[row]) for place, row in enumerate(rows, 1))
+        self.output.insert(END, text) #One widget insert for the whole listing.
+        widget_update("ranking", len(text))
+        self.output.see(1.0) #Show the top of the listing.
+
+if __name__ == "__main__": #Only start the GUI when run directly, so the module can be imported.
+    root = Tk() #Create the main Tkinter window.
+    app = StudentDataApp(root) #Initialize the application.
+    root.mainloop() #Start the Tkinter event loop.
@@ -0,0 +1,129 @@
+import argparse #Import argparse to read the cohort files and options from the command line.
+import json #Import json to write the consolidated report in machine-readable form.
+import os #Import os to pick a default worker count.
+import sys #Import sys to print per-file timings to stderr.
+import time #Import time to measure how long each file takes.
+from collections import Counter #Import Counter to merge grade distributions.
+from concurrent.futures import ProcessPoolExecutor, as_completed #Import the process pool to grade files in parallel.
+
+from student_store import GRADE_LETTERS, Student, StudentTable, iter_student_chunks #Reuse the app's parsing and grading.
+
+
+def summarize_file(file_path): #Grade one cohort file and return its aggregates (runs in a worker process).
+    started = time.perf_counter() #Start the per-file timer.
+    errors = [] #(line number, message) pairs for lines that failed to parse.
+    table = StudentTable() #Columnar store for this cohort.
+    try:
+        for chunk in iter_student_chunks(file_path, on_error=lambda line, message: errors.append((line, message))):
+            table.extend(chunk) #Grades and aggregates are computed as rows are added.
+    except Exception as e: #Missing, unreadable or undecodable file: report it instead of failing the batch.
+        return {"file": file_path, "error": f"{type(e).__name__}: {e}", "seconds": time.perf_counter() - started}
+
+    grades = Counter(table.grades) #Count grade codes in one pass over the column.
+    summary = { #Plain dict so it pickles cheaply back to the parent process.
+        "file": file_path,
+        "count": len(table),
+        "total_sum": table.aggregates.total_sum,
+        "grades": {letter: grades.get(code, 0) for code, letter in enumerate(GRADE_LETTERS)},
+        "highest": _describe(table.highest()),
+        "lowest": _describe(table.lowest()),
+        "errors": len(errors),
+    }
+    summary["seconds"] = time.perf_counter() - started #Stop the timer after all the work.
+    return summary
+
+
+def _describe(student): #Reduce a Student to the fields the report needs.
+    if student is None: #Empty cohort.
+        return None
+    return {"code": student.code, "name": student.name, "total": student.total_score, "grade": student.grade}
+
+
+def merge_summaries(summaries): #Combine per-file aggregates into one overall summary.
+    merged = {"files": 0, "count": 0, "total_sum": 0, "grades": Counter(), "highest": None, "lowest": None, "errors": 0}
+    for summary in summaries: #Merge in input order so ties go to the earliest file, like max()/min().
+        if "error" in summary: #Unreadable files contribute nothing.
+            continue
+        merged["files"] += 1
+        merged["count"] += summary["count"]
+        merged["total_sum"] += summary["total_sum"]
+        merged["grades"].update(summary["grades"])
+        merged["errors"] += summary["errors"]
+        high, low = summary["highest"], summary["lowest"]
+        if high is not None and (merged["highest"] is None or high["total"] > merged["highest"]["total"]):
+            merged["highest"] = high
+        if low is not None and (merged["lowest"] is None or low["total"] < merged["lowest"]["total"]):
+            merged["lowest"] = low
+    merged["grades"] = {letter: merged["grades"].get(letter, 0) for letter in GRADE_LETTERS} #Fixed A-F order.
+    merged["mean_percentage"] = (merged["total_sum"] / merged["count"] / Student.MAX_TOTAL * 100
+                                 if merged["count"] else 0) #Mean of every student's percentage.
+    return merged
+
+
+def grade_files(file_paths, workers=None): #Grade every file across a process pool, printing timings as they finish.
+    results = {} #File path -> summary.
+    with ProcessPoolExecutor(max_workers=workers) as pool: #One task per file.
+        futures = {pool.submit(summarize_file, path): path for path in file_paths}
+        for future in as_completed(futures): #Report each file as soon as it is done.
+            try:
+                summary = future.result()
+            except Exception as e: #The worker itself failed (e.g. it was killed): record it like any bad file.
+                summary = {"file": futures[future], "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+            results[futures[future]] = summary
+            if "error" in summary:
+                print(f"{summary['file']}: ERROR {summary['error']}", file=sys.stderr)
+            else:
+                print(f"{summary['file']}: {summary['count']} students in {summary['seconds'] * 1000:.1f} ms",
+                      file=sys.stderr)
+    return [results[path] for path in file_paths] #Back in input order.
+
+
+def format_report(summaries, merged, elapsed): #Build the plain-text consolidated report.
+    lines = ["--- Cohort Grade Report ---", ""]
+    for summary in summaries: #One line per file.
+        if "error" in summary:
+            lines.append(f"{summary['file']}: ERROR {summary['error']}")
+            continue
+        mean = summary["total_sum"] / summary["count"] / Student.MAX_TOTAL * 100 if summary["count"] else 0
+        lines.append(f"{summary['file']}: {summary['count']} students, mean {mean:.2f}%, "
+                     f"{summary['errors']} bad line(s), {summary['seconds'] * 1000:.1f} ms")
+    lines += ["", "--- Summary ---", #Overall totals.
+              f"Files Graded: {merged['files']}",
+              f"Total Students: {merged['count']}",
+              f"Average Percentage Mark: {merged['mean_percentage']:.2f}%",
+              "Grade Distribution: " + ", ".join(f"{letter}={n}" for letter, n in merged["grades"].items())]
+    for label in ("highest", "lowest"): #Extremes across every cohort.
+        student = merged[label]
+        if student:
+            lines.append(f"{label.capitalize()} Total Score: {student['name']} ({student['code']}) "
+                         f"{student['total']} / {Student.MAX_TOTAL}, grade {student['grade']}")
+    lines.append(f"Skipped Lines: {merged['errors']}")
+    lines.append(f"Elapsed: {elapsed:.2f} s")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None): #Command-line entry point.
+    parser = argparse.ArgumentParser(description="Grade many studentMarks files in parallel and write one report.")
+    parser.add_argument("files", nargs="+", help="cohort files in the studentMarks.txt format")
+    parser.add_argument("-o", "--output", default="cohort_report.txt", help="where to write the report")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--json", action="store_true", help="write the report as JSON instead of text")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter() #Time the whole batch.
+    summaries = grade_files(args.files, args.workers)
+    merged = merge_summaries(summaries)
+    elapsed = time.perf_counter() - started
+
+    with open(args.output, "w") as report: #Write the consolidated report.
+        if args.json:
+            json.dump({"files": summaries, "summary": merged, "seconds": elapsed}, report, indent=2)
+        else:
+            report.write(format_report(summaries, merged, elapsed))
+    print(f"Graded {merged['count']} students from {merged['files']} file(s) in {elapsed:.2f} s; "
+          f"report written to {args.output}", file=sys.stderr)
+    return 0 if merged["files"] == len(summaries) else 1 #Non-zero exit when a file could not be read.
+
+
+if __name__ == "__main__":
+    sys.exit(main())
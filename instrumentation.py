@@ -0,0 +1,124 @@
+import atexit #Import atexit to dump the measurements when the program ends.
+import cProfile #Import cProfile for optional profiling of the instrumented handlers.
+import json #Import json to write the measurements.
+import os #Import os to read the switches from the environment.
+import signal #Import signal to dump the measurements on demand (SIGUSR1).
+import threading #Import threading to install the signal handler only from the main thread.
+import time #Import time for the high-resolution clock.
+from contextlib import contextmanager, nullcontext #Import the context manager helpers for phases.
+from functools import wraps #Import wraps to keep handler names on the timing wrappers.
+
+#Switches, read once at import. With none set, timed() returns handlers unchanged and phase() a shared no-op.
+PROFILE_FILE = os.environ.get("PERF_PROFILE") #cProfile stats for the instrumented handlers are written here.
+ENABLED = bool(os.environ.get("PERF_TRACE") or PROFILE_FILE) #Collect latency, phase and widget-update histograms.
+TRACE_FILE = os.environ.get("PERF_TRACE_FILE", "perf_trace.json") #Where dump() writes the measurements.
+
+NO_PHASE = nullcontext() #Reusable do-nothing context for phase() while disabled.
+
+
+class Histogram: #Count, total, maximum and power-of-two buckets of one measurement.
+    __slots__ = ('count', 'total', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0 #Values recorded.
+        self.total = 0 #Sum of the values.
+        self.maximum = 0 #Largest value seen.
+        self.buckets = {} #Bucket b counts values in [2**(b-1), 2**b).
+
+    def add(self, value): #Record one value (a whole number of microseconds or characters).
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+        bucket = int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def to_dict(self, unit): #JSON-ready summary, buckets labelled by their upper bound.
+        return {"count": self.count, "total": self.total, "mean": self.total / self.count if self.count else 0,
+                "max": self.maximum, "unit": unit,
+                "histogram": {f"<{1 << bucket}": self.buckets[bucket] for bucket in sorted(self.buckets)}}
+
+
+LATENCIES = {} #Handler name -> Histogram of call latencies in microseconds.
+PHASES = {} #Phase name -> Histogram of durations in microseconds.
+WIDGET_UPDATES = {} #Update name -> Histogram of characters written to a widget.
+PROFILER = cProfile.Profile() if PROFILE_FILE else None #Shared by every instrumented handler.
+_profile_depth = 0 #Nesting depth of instrumented calls, so the profiler is enabled once.
+
+
+def _histogram(table, name): #Get or create a named histogram.
+    histogram = table.get(name)
+    if histogram is None:
+        histogram = table[name] = Histogram()
+    return histogram
+
+
+def timed(name=None): #Decorator recording a handler's latency; returns the handler itself when disabled.
+    def decorate(func):
+        if not ENABLED: #Zero overhead: nothing wraps the handler.
+            return func
+        histogram = _histogram(LATENCIES, name or func.__qualname__)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            global _profile_depth
+            if PROFILER is not None:
+                if not _profile_depth: #Outermost instrumented call switches the profiler on.
+                    PROFILER.enable()
+                _profile_depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.add(round((time.perf_counter() - started) * 1_000_000))
+                if PROFILER is not None:
+                    _profile_depth -= 1
+                    if not _profile_depth:
+                        PROFILER.disable()
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def _timed_phase(histogram): #Time the body of a with-block.
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.add(round((time.perf_counter() - started) * 1_000_000))
+
+
+def phase(name): #Context manager timing one phase of work, e.g. with phase("load.parse"): ...
+    if not ENABLED:
+        return NO_PHASE
+    return _timed_phase(_histogram(PHASES, name))
+
+
+def widget_update(name, size): #Record how many characters one widget update wrote.
+    if ENABLED:
+        _histogram(WIDGET_UPDATES, name).add(size)
+
+
+def snapshot(): #All measurements so far as a JSON-ready dict.
+    return {"latency": {name: h.to_dict("us") for name, h in LATENCIES.items()},
+            "phases": {name: h.to_dict("us") for name, h in PHASES.items()},
+            "widget_updates": {name: h.to_dict("chars") for name, h in WIDGET_UPDATES.items()}}
+
+
+def dump(file_path=None): #Write the measurements (and profile, if enabled) to disk; returns the JSON path.
+    file_path = file_path or TRACE_FILE
+    with open(file_path, "w") as file:
+        json.dump(snapshot(), file, indent=2)
+    if PROFILER is not None:
+        PROFILER.dump_stats(PROFILE_FILE) #Inspect with python -m pstats
+    return file_path
+
+
+def _dump_on_signal(signum, frame): #SIGUSR1 handler: dump without stopping the program.
+    print(f"Performance trace written to {dump()}")
+
+
+if ENABLED: #Dump at exit, and on kill -USR1 <pid> where the platform has it.
+    atexit.register(dump)
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGUSR1, _dump_on_signal)
@@ -0,0 +1,404 @@
+import argparse #Import argparse for the worksheet command line.
+import asyncio #Import asyncio for the multi-session manager.
+import csv #Import csv to export timing traces.
+import random #Import the random module for generating numbers and operations
+import struct #Import struct to pack event-log records.
+import time #Import time to measure response latency.
+from array import array #Import array to store batches of problems compactly.
+from collections import deque #Import deque for the scheduler's rolling window.
+from itertools import count #Import count to number sessions in an event log.
+
+NUMBER_DIGITS = {1: (1, 9), 2: (10, 99), 3: (1000, 9999)} #Map difficulty to min/max range
+#Adaptive difficulty steps, easiest first: (operand range, operations). Fills the 2- to 4-digit gap with 3 digits.
+ADAPTIVE_LADDER = (((1, 9), '+'), ((1, 9), '+-'), ((10, 99), '+'), ((10, 99), '+-'),
+                   ((100, 999), '+'), ((100, 999), '+-'), ((1000, 9999), '+-'))
+OPERATIONS = '+-' #Operations a problem can use.
+MAX_QUESTIONS = 10 #Define the total number of questions per quiz
+POINTS_FIRST_TRY = 10 #Points for a correct first attempt.
+POINTS_SECOND_TRY = 5 #Points for a correct second attempt.
+
+#Session states
+READY = 'READY' #Created or finished a question; waiting for next_problem().
+ASKING = 'ASKING' #A problem is on screen and answers are accepted.
+FINISHED = 'FINISHED' #All questions asked; results are available.
+
+#Outcomes returned by QuizSession.check_answer()
+CORRECT = 'CORRECT' #Correct on the first attempt.
+CORRECT_SECOND_TRY = 'CORRECT_SECOND_TRY' #Correct on the second attempt.
+TRY_AGAIN = 'TRY_AGAIN' #Wrong on the first attempt; one more try allowed.
+INCORRECT = 'INCORRECT' #Wrong on the second attempt; the question is over.
+OUTCOME_CODES = {None: 0, CORRECT: 1, CORRECT_SECOND_TRY: 2, TRY_AGAIN: 3, INCORRECT: 4} #Outcome -> byte in the event log.
+OUTCOMES = {code: outcome for outcome, code in OUTCOME_CODES.items()} #Byte in the event log -> outcome.
+
+#Event log records: a shared header (kind, session id, time in microseconds) followed by a kind-specific body.
+EVENT_HEADER = struct.Struct('<BIq')
+EVENT_START, EVENT_PROBLEM, EVENT_ANSWER, EVENT_END = 1, 2, 3, 4 #Record kinds.
+EVENT_BODIES = {
+    EVENT_START: struct.Struct('<hHB'), #Difficulty, questions per quiz, adaptive flag.
+    EVENT_PROBLEM: struct.Struct('<icii'), #num1, operation, num2, answer.
+    EVENT_ANSWER: struct.Struct('<qB'), #Submitted answer, outcome code.
+    EVENT_END: struct.Struct('<i'), #Final score.
+}
+
+
+class ProblemBatch: #A batch of problems stored column by column.
+
+    def __init__(self, first, operations, second, answers): #Wrap the operand, operator and answer columns.
+        self.first = first #Left operands.
+        self.operations = operations #One '+' or '-' character per problem.
+        self.second = second #Right operands.
+        self.answers = answers #Correct answers.
+
+    def __len__(self): #Number of problems in the batch.
+        return len(self.answers)
+
+    def __getitem__(self, i): #Return one problem as (num1, operation, num2, answer).
+        return self.first[i], self.operations[i], self.second[i], self.answers[i]
+
+    def __iter__(self): #Iterate over (num1, operation, num2, answer) tuples.
+        return zip(self.first, self.operations, self.second, self.answers)
+
+
+class ProblemGenerator: #Creates arithmetic problems in batches, independent of any GUI.
+
+    def __init__(self, seed=None, ranges=NUMBER_DIGITS): #Seed the generator for reproducible problem sets.
+        self.rng = random.Random(seed) #Private random source, so a seed always gives the same problems.
+        self.ranges = ranges #Difficulty level -> (min, max) operand range.
+
+    def generate(self, count, level): #Create count problems for a difficulty level.
+        low, high = self.ranges.get(level, (1, 9)) #Determine the number range based on the difficulty level
+        return self.generate_range(count, low, high)
+
+    def generate_range(self, count, low, high, operations=OPERATIONS): #Create count problems with operands in [low, high].
+        values = range(low, high + 1) #Operand population; choices() draws from it without building a list.
+        first = array('q', self.rng.choices(values, k=count)) #All left operands in one call.
+        second = array('q', self.rng.choices(values, k=count)) #All right operands in one call.
+        chosen = ''.join(self.rng.choices(operations, k=count)) #All operations in one call.
+        answers = array('q', [a + b if op == '+' else a - b for a, op, b in zip(first, chosen, second)]) #Answers in bulk.
+        return ProblemBatch(first, chosen, second, answers)
+
+
+def rank_for(score_percent): #Determine rank based on score percentage
+    if score_percent > 90:
+        return "A+"
+    elif score_percent > 75:
+        return "A"
+    elif score_percent > 60:
+        return "B"
+    elif score_percent > 40:
+        return "C"
+    else:
+        return "D"
+
+
+class AdaptiveScheduler: #Picks each problem's range and operation to hold a target accuracy.
+    TRACE_FIELDS = ('question', 'step', 'num1', 'operation', 'num2', 'attempts', 'solved', 'latency_ms')
+
+    def __init__(self, target_accuracy=0.75, window=10, tolerance=0.1, slow_seconds=10.0,
+                 start_step=0, ladder=ADAPTIVE_LADDER, min_questions=3): #Start on the easiest step by default.
+        self.target_accuracy = target_accuracy #Share of questions to answer right first time.
+        self.tolerance = tolerance #How far accuracy may drift before the step changes.
+        self.min_questions = min_questions #Questions answered at a step before it is judged.
+        self.slow_seconds = slow_seconds #Mean answer time above which the scheduler won't step up.
+        self.ladder = ladder #Available steps, easiest first.
+        self.step = start_step #Current position on the ladder.
+        self.recent = deque(maxlen=window) #(correct first time, latency) for the last few questions.
+        self.correct_count = 0 #Running count of correct answers in the window.
+        self.latency_sum = 0.0 #Running sum of latencies in the window.
+        self.since_change = 0 #Questions answered since the step last changed.
+        self.trace = [] #One TRACE_FIELDS tuple per question, for export.
+
+    def next_parameters(self): #(low, high, operations) for the next problem.
+        (low, high), operations = self.ladder[self.step]
+        return low, high, operations
+
+    def accuracy(self): #Share of recent questions answered right first time.
+        return self.correct_count / len(self.recent) if self.recent else 0.0
+
+    def mean_latency(self): #Mean seconds per recent question.
+        return self.latency_sum / len(self.recent) if self.recent else 0.0
+
+    def record(self, problem, attempts, solved, latency): #Record one finished question and adjust the step; O(1).
+        correct = solved and attempts == 1 #Only first-try answers count towards accuracy.
+        if len(self.recent) == self.recent.maxlen: #Drop the oldest question from the running sums.
+            old_correct, old_latency = self.recent[0]
+            self.correct_count -= old_correct
+            self.latency_sum -= old_latency
+        self.recent.append((correct, latency)) #The deque evicts the oldest entry itself.
+        self.correct_count += correct
+        self.latency_sum += latency
+        num1, operation, num2, _ = problem
+        self.trace.append((len(self.trace) + 1, self.step, num1, operation, num2, attempts, solved,
+                           round(latency * 1000, 1)))
+        self.since_change += 1
+        self._adjust()
+
+    def _adjust(self): #Move one step up or down once enough questions have been seen at this step.
+        if self.since_change < self.min_questions: #Give each step a few questions before judging it.
+            return
+        accuracy = self.accuracy()
+        if (accuracy > self.target_accuracy + self.tolerance and self.mean_latency() < self.slow_seconds
+                and self.step < len(self.ladder) - 1): #Too easy: step up.
+            self._change_step(1)
+        elif accuracy < self.target_accuracy - self.tolerance and self.step > 0: #Too hard: step down.
+            self._change_step(-1)
+
+    def _change_step(self, delta): #Move along the ladder and judge the new step on its own answers only.
+        self.step += delta
+        self.since_change = 0
+        self.recent.clear() #Answers from the old step say little about the new one.
+        self.correct_count = 0
+        self.latency_sum = 0.0
+
+    def export_trace(self, file_path): #Write the per-question timing trace as CSV.
+        with open(file_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(self.TRACE_FIELDS)
+            writer.writerows(self.trace)
+
+
+DEFAULT_GENERATOR = ProblemGenerator() #Shared by sessions that don't bring their own generator.
+
+
+class QuizSession: #State of one quiz, with no GUI or module globals.
+    __slots__ = ('generator', 'max_questions', 'difficulty', 'score', 'question_count', 'attempt_count',
+                 'current_answer', 'problem', 'state', '_problems', 'scheduler', 'asked_at', 'recorder', 'log_id')
+
+    def __init__(self, generator=None, max_questions=MAX_QUESTIONS, difficulty=1, scheduler=None,
+                 recorder=None): #Create a session ready to ask.
+        self.generator = generator or DEFAULT_GENERATOR #Problem source.
+        self.max_questions = max_questions #Questions per quiz.
+        self.recorder = recorder #QuizEventLog receiving every event, or None.
+        self.start(difficulty, scheduler) #Default difficulty level (1: Easy, 2: Moderate, 3: Advanced)
+
+    def start(self, difficulty, scheduler=None, now=None): #Reset the score and prefetch every problem for a new quiz.
+        self.difficulty = difficulty #Set the chosen level
+        self.scheduler = scheduler #AdaptiveScheduler choosing each problem, or None for a fixed level.
+        self.asked_at = 0.0 #When the current problem was shown.
+        self.score = 0 #Reset score
+        self.question_count = 0 #Reset question count
+        self.attempt_count = 0 #Reset attempt count
+        self.current_answer = 0 #Stores the correct answer for the current problem
+        self.problem = None #Current (num1, operation, num2, answer)
+        self.state = READY
+        if scheduler is None: #Fixed level: one batch per quiz
+            self._problems = iter(self.generator.generate(self.max_questions, difficulty))
+        else: #Adaptive: each problem depends on the answers so far
+            self._problems = None
+        if self.recorder is not None: #Each quiz is a new session in the log.
+            self.log_id = self.recorder.start(self, _now(now))
+
+    def next_problem(self, now=None): #Advance to the next problem; returns it, or None once the quiz is over.
+        now = _now(now)
+        if self.question_count >= self.max_questions:
+            if self.state != FINISHED and self.recorder is not None: #Log the final score once.
+                self.recorder.end(self, now)
+            self.state = FINISHED #End quiz if max questions reached
+            return None
+        self.question_count += 1 #Increment question counter
+        self.attempt_count = 1 #Reset attempt count to 1 for a new question
+        if self.scheduler is None:
+            self.problem = next(self._problems) #Take the next problem from the prefetched batch
+        else:
+            self.problem = self.generator.generate_range(1, *self.scheduler.next_parameters())[0]
+        self.current_answer = self.problem[3]
+        self.state = ASKING
+        self.asked_at = now #Start the response timer.
+        if self.recorder is not None:
+            self.recorder.problem(self, now)
+        return self.problem
+
+    def is_correct(self, user_answer): #Check if the user's answer matches the current correct answer
+        return user_answer == self.current_answer
+
+    def check_answer(self, user_answer, now=None): #Score an answer; returns an outcome, or None if no question is open.
+        now = _now(now)
+        outcome = self._score_answer(user_answer, now)
+        if self.recorder is not None:
+            self.recorder.answer(self, user_answer, outcome, now)
+        return outcome
+
+    def _score_answer(self, user_answer, now): #Apply the scoring rules to one answer.
+        if self.state != ASKING: #Ignore answers between questions (e.g. during the feedback delay).
+            return None
+        if self.is_correct(user_answer):
+            if self.attempt_count == 1:
+                self.score += POINTS_FIRST_TRY #10 points for first attempt
+                outcome = CORRECT
+            else:
+                self.score += POINTS_SECOND_TRY #5 points for second attempt
+                outcome = CORRECT_SECOND_TRY
+        else:
+            self.attempt_count += 1 #Increment attempt count
+            if self.attempt_count <= 2: #Failed on first attempt, give another try
+                return TRY_AGAIN
+            outcome = INCORRECT #Failed on second attempt (third check)
+        self.state = READY #The question is over.
+        if self.scheduler is not None: #Report the finished question's latency and attempts.
+            self.scheduler.record(self.problem, min(self.attempt_count, 2), outcome != INCORRECT, now - self.asked_at)
+        return outcome
+
+    def max_score(self): #Best possible score for this quiz.
+        return self.max_questions * POINTS_FIRST_TRY
+
+    def score_percent(self): #Calculate percentage score
+        return (self.score / self.max_score()) * 100
+
+    def results(self): #Final (score, percentage, rank).
+        percent = self.score_percent()
+        return self.score, percent, rank_for(percent)
+
+
+def _now(now): #Use the caller's clock reading, or read the clock.
+    return time.perf_counter() if now is None else now
+
+
+class QuizSessionManager: #Holds many concurrent quiz sessions for an asyncio server.
+
+    def __init__(self, generator=None, max_questions=MAX_QUESTIONS, recorder=None): #Create an empty manager.
+        self.generator = generator or DEFAULT_GENERATOR #Shared by every session.
+        self.max_questions = max_questions #Questions per quiz.
+        self.recorder = recorder #QuizEventLog shared by every session, or None.
+        self.sessions = {} #Session id -> QuizSession.
+        self._next_id = 0 #Next session id to hand out.
+
+    def __len__(self): #Number of open sessions.
+        return len(self.sessions)
+
+    async def open(self, difficulty): #Start a quiz; returns (session id, first problem).
+        session_id = self._next_id
+        self._next_id += 1
+        session = self.sessions[session_id] = QuizSession(self.generator, self.max_questions, difficulty,
+                                                          recorder=self.recorder)
+        return session_id, session.next_problem()
+
+    async def answer(self, session_id, user_answer): #Submit an answer; returns (outcome, next problem or None).
+        session = self.sessions[session_id] #KeyError for unknown or closed sessions.
+        outcome = session.check_answer(user_answer)
+        if outcome in (CORRECT, CORRECT_SECOND_TRY, INCORRECT): #Question over: move straight on, no delay.
+            await asyncio.sleep(0) #Let other sessions run between questions.
+            return outcome, session.next_problem()
+        return outcome, session.problem if outcome == TRY_AGAIN else None
+
+    async def results(self, session_id): #(score, percentage, rank) for a session.
+        return self.sessions[session_id].results()
+
+    async def close(self, session_id): #Forget a session; returns its final results.
+        return self.sessions.pop(session_id).results()
+
+
+class QuizEventLog: #Append-only binary log of quiz sessions: starts, problems, answers and final scores.
+
+    def __init__(self, file_path): #Open (or create) a log for appending.
+        self.file_path = file_path
+        self.file = open(file_path, 'ab') #Buffered; flushed at the end of each session.
+        self._ids = count(random.getrandbits(31)) #Random start keeps ids apart across runs appending to one file.
+
+    def _write(self, kind, session, now, *body): #Pack and append one record.
+        self.file.write(EVENT_HEADER.pack(kind, session.log_id, int(now * 1_000_000)) + EVENT_BODIES[kind].pack(*body))
+
+    def start(self, session, now): #Log a new quiz; returns the session's id in this log.
+        session.log_id = next(self._ids) & 0xFFFFFFFF
+        self._write(EVENT_START, session, now, session.difficulty, session.max_questions, session.scheduler is not None)
+        return session.log_id
+
+    def problem(self, session, now): #Log the problem just shown.
+        num1, operation, num2, answer = session.problem
+        self._write(EVENT_PROBLEM, session, now, num1, operation.encode(), num2, answer)
+
+    def answer(self, session, user_answer, outcome, now): #Log a submitted answer and how it was scored.
+        user_answer = max(-2**63, min(user_answer, 2**63 - 1)) #Clamp huge typed numbers; they are wrong either way.
+        self._write(EVENT_ANSWER, session, now, user_answer, OUTCOME_CODES[outcome])
+
+    def end(self, session, now): #Log the final score and make the session durable.
+        self._write(EVENT_END, session, now, session.score)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_events(file_path): #Yield (kind, session id, seconds, body tuple) for every record in a log.
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    offset, header_size = 0, EVENT_HEADER.size
+    while offset + header_size <= len(data):
+        kind, session_id, micros = EVENT_HEADER.unpack_from(data, offset)
+        body = EVENT_BODIES.get(kind)
+        if body is None or offset + header_size + body.size > len(data): #Torn or corrupt record (e.g. a crash
+            return #mid-write): nothing after it can be trusted.
+        yield kind, session_id, micros / 1_000_000, body.unpack_from(data, offset + header_size)
+        offset += header_size + body.size
+
+
+def _replayed_problems(queue): #Feeds logged problems to a replayed session, one per next_problem().
+    while True:
+        yield queue.popleft()
+
+
+class LoggedProblems: #Problem source for a replayed session: hands out the problems read from the log.
+
+    def __init__(self): #Start with no problems; replay() queues each one as its record is read.
+        self.queue = deque()
+
+    def generate(self, count, level): #Fixed-level quiz: a lazy feed instead of a prefetched batch.
+        return _replayed_problems(self.queue)
+
+    def generate_range(self, count, low, high, operations=OPERATIONS): #Adaptive quiz: the next logged problem.
+        return [self.queue.popleft()]
+
+
+def replay(file_path): #Drive every logged session through QuizSession headlessly; returns a summary dict.
+    sessions = {} #Log id -> (QuizSession, queue of logged problems).
+    summary = {"sessions": 0, "answers": 0, "mismatches": 0}
+    started = time.perf_counter()
+    for kind, session_id, now, body in read_events(file_path):
+        if kind == EVENT_START: #Fresh session fed from the log, so no problems are generated.
+            difficulty, max_questions, _ = body
+            problems = LoggedProblems()
+            session = QuizSession(problems, max_questions, difficulty)
+            sessions[session_id] = (session, problems.queue)
+            summary["sessions"] += 1
+            continue
+        if session_id not in sessions: #Events whose START was not logged (e.g. a truncated file).
+            continue
+        session, problems = sessions[session_id]
+        if kind == EVENT_PROBLEM:
+            num1, operation, num2, answer = body
+            problems.append((num1, operation.decode(), num2, answer))
+            session.next_problem(now)
+        elif kind == EVENT_ANSWER:
+            user_answer, outcome_code = body
+            summary["answers"] += 1
+            if session.check_answer(user_answer, now) != OUTCOMES[outcome_code]: #Scoring rules changed?
+                summary["mismatches"] += 1
+        else: #EVENT_END: the replayed score must match the logged one.
+            if session.next_problem(now) is not None or session.score != body[0]:
+                summary["mismatches"] += 1
+            del sessions[session_id]
+    summary["seconds"] = time.perf_counter() - started
+    summary["answers_per_second"] = summary["answers"] / summary["seconds"] if summary["seconds"] else 0.0
+    return summary
+
+
+def format_problem(num1, operation, num2): #Render a problem the way the quiz shows it.
+    return f"{num1} {operation} {num2} = ?"
+
+
+if __name__ == "__main__": #Print a worksheet, e.g. python quiz_engine.py --count 20 --level 2 --seed 7
+    parser = argparse.ArgumentParser(description="Generate an arithmetic worksheet, or replay a quiz event log.")
+    parser.add_argument("--replay", metavar="LOG", help="replay an event log headlessly and report the results")
+    parser.add_argument("--count", type=int, default=10, help="number of problems")
+    parser.add_argument("--level", type=int, default=1, choices=sorted(NUMBER_DIGITS), help="difficulty level")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible worksheet")
+    parser.add_argument("--answers", action="store_true", help="include the answers")
+    args = parser.parse_args()
+    if args.replay: #Replay instead of printing a worksheet.
+        result = replay(args.replay)
+        print(f"Replayed {result['sessions']} sessions, {result['answers']} answers in {result['seconds']:.3f} s "
+              f"({result['answers_per_second']:.0f} answers/s), {result['mismatches']} mismatch(es)")
+        raise SystemExit(1 if result["mismatches"] else 0)
+    batch = ProblemGenerator(args.seed).generate(args.count, args.level)
+    for number, (num1, operation, num2, answer) in enumerate(batch, 1):
+        line = f"{number:>4}. {format_problem(num1, operation, num2)}"
+        print(f"{line}   {answer}" if args.answers else line)
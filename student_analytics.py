@@ -0,0 +1,133 @@
+import argparse #Import argparse for the command-line report.
+import sys #Import sys to print errors and exit with a status.
+from operator import sub #Import sub to derive coursework totals from total - exam.
+
+from student_store import GRADE_LETTERS, Student, load_table #Reuse the store, its loader and its grading.
+
+SCORE_KEYS = ("total", "coursework", "exam") #Scores students can be ranked by.
+MAX_SCORE = {"total": Student.MAX_TOTAL, "coursework": Student.MAX_COURSEWORK, "exam": Student.MAX_EXAM}
+#Grade code for every possible score of each key, using Student's percentage thresholds.
+GRADE_BY_SCORE = {key: bytes(GRADE_LETTERS.index(Student.grade_for_percentage(score / top * 100))
+                             for score in range(top + 1))
+                  for key, top in MAX_SCORE.items()}
+
+
+class StudentAnalytics: #Grade distributions, percentile ranks and top/bottom-k over a StudentTable.
+
+    def __init__(self, table): #Analyse a table; results are cached until the table changes.
+        self.table = table #Backing table.
+        self._version = None #Table version the caches were built from.
+        self._values = {} #Key -> list of per-row scores.
+        self._histograms = {} #Key -> Counter of score -> students.
+        self._ranks = {} #Key -> score -> percentile rank.
+
+    def _refresh(self): #Drop every cache if the table has changed since it was built.
+        if self._version != self.table.version:
+            self._values.clear()
+            self._histograms.clear()
+            self._ranks.clear()
+            self._version = self.table.version
+
+    def _check_key(self, key): #Reject unknown keys up front.
+        if key not in MAX_SCORE:
+            raise ValueError(f"Unknown score key '{key}'; expected one of {', '.join(SCORE_KEYS)}")
+
+    def values(self, key="total"): #Per-row scores for a key, as a list (snapshot columns have no index()).
+        self._check_key(key)
+        self._refresh()
+        values = self._values.get(key)
+        if values is None:
+            table = self.table
+            if key == "coursework": #Coursework is total minus exam, so the three mark columns are never read.
+                values = list(map(sub, table.totals, table.exam_marks))
+            else:
+                values = (table.totals if key == "total" else table.exam_marks).tolist()
+            self._values[key] = values
+        return values
+
+    def histogram(self, key="total"): #Counter of score -> number of students.
+        self._check_key(key)
+        self._refresh()
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            aggregates = self.table.aggregates #Every histogram is maintained as rows are stored.
+            histogram = aggregates.histogram if key == "total" else aggregates.mark_histograms[key]
+            histogram = +histogram #Copy without zero counts, so later edits don't leak in.
+            self._histograms[key] = histogram
+        return histogram
+
+    def grade_histogram(self, key="total"): #Students per grade letter, A to F, graded on this key's percentage.
+        grades = GRADE_BY_SCORE[key]
+        counts = [0] * len(GRADE_LETTERS)
+        for score, n in self.histogram(key).items(): #One step per distinct score, not per student.
+            counts[grades[score]] += n
+        return dict(zip(GRADE_LETTERS, counts))
+
+    def _rank_by_score(self, key): #Score -> percentage of students below it, counting ties as half.
+        self._refresh()
+        ranks = self._ranks.get(key)
+        if ranks is None:
+            histogram, count = self.histogram(key), len(self.table)
+            ranks, below = {}, 0
+            for score in sorted(histogram): #Cumulative counts from the lowest score up.
+                ranks[score] = (below + 0.5 * histogram[score]) / count * 100
+                below += histogram[score]
+            self._ranks[key] = ranks
+        return ranks
+
+    def percentile_rank(self, row, key="total"): #Percentage of students scoring below this row, counting ties as half.
+        return self._rank_by_score(key)[self.values(key)[row]]
+
+    def percentile_ranks(self, key="total"): #Percentile rank of every student, in row order.
+        return list(map(self._rank_by_score(key).__getitem__, self.values(key)))
+
+    def top_k(self, k, key="total"): #The k best rows by a key, highest first, file order on ties.
+        return self._select(k, key, highest=True)
+
+    def bottom_k(self, k, key="total"): #The k worst rows by a key, lowest first, file order on ties.
+        return self._select(k, key, highest=False)
+
+    def _select(self, k, key, highest): #Walk the histogram from the best score, finding only the rows needed.
+        values = self.values(key)
+        histogram = self.histogram(key)
+        rows = []
+        for score in sorted(histogram, reverse=highest): #Best scores first; the histogram says how many rows each has.
+            row = -1
+            for _ in range(min(k - len(rows), histogram[score])): #Each index() is a C-level scan from the last hit.
+                row = values.index(score, row + 1)
+                rows.append(row)
+            if len(rows) >= k:
+                break
+        return rows
+
+
+def format_ranking(analytics, rows, key): #One line per student: code, name, score and percentile rank.
+    table = analytics.table
+    values = analytics.values(key)
+    return "\n".join(f"{table.codes[row]:>8}  {table.name_at(row):<30} {values[row]:>4} / {MAX_SCORE[key]}"
+                     f"  {analytics.percentile_rank(row, key):6.2f} pct" for row in rows)
+
+
+def main(argv=None): #Command-line entry point: grade distribution and top/bottom-k for one file.
+    parser = argparse.ArgumentParser(description="Grade distribution and rankings for a studentMarks file.")
+    parser.add_argument("file", help="file in the studentMarks.txt format")
+    parser.add_argument("--key", choices=SCORE_KEYS, default="total", help="score to rank by")
+    parser.add_argument("-k", "--top", type=int, default=10, help="how many students to list at each end")
+    args = parser.parse_args(argv)
+
+    try:
+        analytics = StudentAnalytics(load_table(args.file, use_snapshot=False, on_error=lambda line, message:
+                                                print(f"Line {line}: {message}", file=sys.stderr)))
+    except (OSError, ValueError) as e: #Missing or unreadable file, or rows the table rejects.
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Grade distribution by {args.key}: " +
+          ", ".join(f"{letter}={n}" for letter, n in analytics.grade_histogram(args.key).items()))
+    print(f"\nTop {args.top} by {args.key}:\n{format_ranking(analytics, analytics.top_k(args.top, args.key), args.key)}")
+    print(f"\nBottom {args.top} by {args.key}:\n"
+          f"{format_ranking(analytics, analytics.bottom_k(args.top, args.key), args.key)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
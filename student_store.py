@@ -0,0 +1,583 @@
+from array import array #Import array for the compact columnar student store.
+from collections import Counter #Import Counter for the score histograms.
+import heapq #Import heapq to pick the best name matches without sorting them all.
+from itertools import chain, islice #Import islice to read the file in fixed-size chunks, chain to merge postings.
+import mmap #Import mmap to map the binary snapshot without copying it.
+import os #Import os to swap a finished snapshot into place.
+import struct #Import struct to pack the snapshot header.
+
+from instrumentation import phase #Import the phase timer (a no-op unless PERF_TRACE is set).
+
+DATA_FILE = "studentMarks.txt" #Define the name of the file to read.
+CHUNK_SIZE = 5000 #Number of lines parsed per chunk while loading.
+CODE_MIN, CODE_MAX = -2**63, 2**63 - 1 #Student codes are stored in a signed 64-bit column.
+SNAPSHOT_SUFFIX = ".snapshot" #Suffix of the binary cache written next to the data file.
+SNAPSHOT_MAGIC = b"STUSNAP2" #Identifies a snapshot file and its format version.
+#Header: magic, byte-order check, source size, source mtime (ns), rows, name pool bytes, highest row,
+#lowest row, sum of totals, then total, coursework and exam histogram entries. Native byte order, no padding.
+SNAPSHOT_HEADER = struct.Struct("=8sQQqQQqqqQQQ")
+SNAPSHOT_BYTE_ORDER = 0x0102030405060708 #Reads back differently on a machine with another byte order.
+NAME_START = "\x02" #Marks where a name starts, so its first trigram also answers prefix searches.
+NAME_END = "\x03\x03" #Pads the end so every character starts a trigram, which answers 1- and 2-character searches.
+RANK_ROW_BITS = 32 #A name rank key holds the name length above this many bits and the row below them.
+ROW_MASK = (1 << RANK_ROW_BITS) - 1 #Extracts the row from a rank key.
+NAME_SCAN_ROWS = 20000 #Rows past the name index that one search checks directly while indexing is still running.
+NAME_COUNT_ROWS = 2000 #Candidates a long query verifies to count its matches exactly; beyond that the count is estimated.
+
+class Student: #Lightweight view of one row in a StudentTable.
+    MAX_COURSEWORK = 60 #Define max mark for three coursework components
+    MAX_EXAM = 100 #Define max mark for the examination.
+    MAX_TOTAL = 160 #Define max overall possible mark 
+    __slots__ = ('_table', '_row') #A view only stores its table and row number.
+
+    def __init__(self, code, name, m1, m2, m3, exam): #Initialize a standalone student backed by a single row.
+        self._table = _StudentRow(code, name, m1, m2, m3, exam) #Small stand-in for a one-row table.
+        self._row = 0 #The student is the row's only entry.
+
+    @classmethod
+    def _view(cls, table, row): #Create a view onto an existing table row without copying data.
+        student = cls.__new__(cls) #Skip __init__ so no data is copied.
+        student._table = table #Store the backing table.
+        student._row = row #Store the row number.
+        return student
+
+    @property
+    def code(self): return self._table.codes[self._row] #Student code.
+
+    @property
+    def name(self): return self._table.name_at(self._row) #Student name, decoded from the name pool.
+
+    @property
+    def coursework_marks(self): return [column[self._row] for column in self._table.coursework_columns] #Individual coursework marks.
+
+    @property
+    def exam_mark(self): return self._table.exam_marks[self._row] #Examination mark.
+
+    @property
+    def total_coursework(self): return sum(self.coursework_marks) #Total coursework mark (out of 60).
+
+    @property
+    def total_score(self): return self._table.totals[self._row] #Total overall score (out of 160).
+
+    @property
+    def percentage(self): return (self.total_score / self.MAX_TOTAL) * 100 #Overall percentage.
+
+    @property
+    def grade(self): return GRADE_LETTERS[self._table.grades[self._row]] #Grade computed when the row was stored.
+
+    def _calculate_grade(self): #Internal method to determine the letter grade.
+        return self.grade_for_percentage(self.percentage)
+
+    @staticmethod
+    def grade_for_percentage(percentage): #Map a percentage to its letter grade.
+        if percentage >= 70: return 'A' #A for 70%+.
+        elif percentage >= 60: return 'B' #B for 60-69%.
+        elif percentage >= 50: return 'C' #C for 50-59%.
+        elif percentage >= 40: return 'D' #D for 40-49%.
+        else: return 'F' #F for under 40%.
+
+    def get_display_info(self): #Formats student data into a display string.
+        return ( #Return a formatted multiline string.
+            f"Name: {self.name}\n" #Student Name.
+            f"Code: {self.code}\n" #Student Number.
+            f"Total Coursework Mark: {self.total_coursework} / {self.MAX_COURSEWORK}\n" #Total Coursework Mark.
+            f"Exam Mark: {self.exam_mark} / {self.MAX_EXAM}\n" #Exam Mark.
+            f"Overall Percentage: {self.percentage:.2f}%\n" #Overall Percentage (2 decimal places).
+            f"Student Grade: {self.grade}\n" #Final Grade.
+        )
+
+
+class _StudentRow: #One student's values, shaped like a one-row StudentTable so Student's properties work unchanged.
+    __slots__ = ('code', 'name', 'marks', 'exam', 'total', 'grade')
+
+    def __init__(self, code, name, m1, m2, m3, exam): #Store one row without any arrays or aggregates.
+        self.code = code #Student code.
+        self.name = name #Student name.
+        self.marks = (m1, m2, m3) #Coursework marks.
+        self.exam = exam #Examination mark.
+        self.total = m1 + m2 + m3 + exam #Total overall score.
+        self.grade = GRADE_BY_TOTAL[min(max(self.total, 0), Student.MAX_TOTAL)] #Totals outside 0-160 clamp to the nearest grade.
+
+    #One-element "columns", built only when a property reads them.
+    codes = property(lambda self: (self.code,))
+    coursework_columns = property(lambda self: tuple((mark,) for mark in self.marks))
+    exam_marks = property(lambda self: (self.exam,))
+    totals = property(lambda self: (self.total,))
+    grades = property(lambda self: (self.grade,))
+
+    def name_at(self, row): #The row's name.
+        return self.name
+
+
+GRADE_LETTERS = 'ABCDF' #Grade letters, indexed by the codes stored in StudentTable.grades.
+#Grade code for every possible total score, built once from Student's thresholds.
+GRADE_BY_TOTAL = bytes(GRADE_LETTERS.index(Student.grade_for_percentage(total / Student.MAX_TOTAL * 100))
+                       for total in range(Student.MAX_TOTAL + 1))
+
+
+class ScoreAggregates: #Running statistics over a StudentTable's totals, kept up to date as rows change.
+
+    def __init__(self, table): #Start with empty statistics for a table.
+        self._table = table #Backing table, used to resolve rows.
+        self.count = 0 #Number of students counted.
+        self.total_sum = 0 #Sum of every total score.
+        self.histogram = Counter() #Total score -> number of students with it.
+        self.mark_histograms = {"coursework": Counter(), "exam": Counter()} #Same for coursework and exam marks.
+        self._extremes = (None, None) #(highest row, lowest row); either is None until known again after an edit.
+
+    def add_totals(self, first_row, totals): #Count a run of new rows starting at first_row.
+        if not totals: #Nothing to add.
+            return
+        was_empty = self.count == 0 #Whether these are the first rows.
+        self.count += len(totals) #Update the running count.
+        self.total_sum += sum(totals) #Update the running sum.
+        self.histogram.update(totals) #Update the score histogram.
+        high_row, low_row = self._extremes
+        high, low = max(totals), min(totals) #Extremes of the new rows.
+        column = self._table.totals #max()/min() keep the first row on ties, so only strictly better rows win.
+        #An extreme an edit invalidated stays None and is recomputed lazily instead.
+        if was_empty or (high_row is not None and high > column[high_row]):
+            high_row = first_row + totals.index(high)
+        if was_empty or (low_row is not None and low < column[low_row]):
+            low_row = first_row + totals.index(low)
+        self._extremes = (high_row, low_row)
+
+    def add_marks(self, coursework, exams): #Count the coursework and exam marks of new rows.
+        self.mark_histograms["coursework"].update(coursework)
+        self.mark_histograms["exam"].update(exams)
+
+    def replace_marks(self, old_coursework, old_exam, new_coursework, new_exam): #Move an edited row's marks.
+        for key, old, new in (("coursework", old_coursework, new_coursework), ("exam", old_exam, new_exam)):
+            histogram = self.mark_histograms[key]
+            histogram[old] -= 1
+            if not histogram[old]:
+                del histogram[old]
+            histogram[new] += 1
+
+    def replace_total(self, row, old_total, new_total): #Adjust the statistics after a row's total is edited.
+        self.total_sum += new_total - old_total #Update the running sum.
+        self.histogram[old_total] -= 1 #Move the row to its new histogram bucket.
+        if not self.histogram[old_total]:
+            del self.histogram[old_total]
+        self.histogram[new_total] += 1
+        column = self._table.totals #Already holds new_total at row.
+        high_row, low_row = self._extremes
+        if high_row == row: #The highest row itself changed: still highest unless it went down.
+            if new_total < old_total:
+                high_row = None #Recompute on demand.
+        elif high_row is not None and (new_total, -row) > (column[high_row], -high_row): #Beats it (first row on ties).
+            high_row = row
+        if low_row == row: #Likewise for the lowest row.
+            if new_total > old_total:
+                low_row = None
+        elif low_row is not None and (new_total, row) < (column[low_row], low_row):
+            low_row = row
+        self._extremes = (high_row, low_row)
+
+    def _resolve_extremes(self): #Recompute an extreme an edit invalidated; the other one is kept.
+        high_row, low_row = self._extremes
+        if self.count and (high_row is None or low_row is None): #Value from the histogram, row from a C-level search.
+            column = self._table.totals
+            if high_row is None:
+                high_row = column.index(max(self.histogram))
+            if low_row is None:
+                low_row = column.index(min(self.histogram))
+            self._extremes = (high_row, low_row)
+        return self._extremes
+
+    def highest_row(self): #Row with the highest total score (first on ties).
+        return self._resolve_extremes()[0]
+
+    def lowest_row(self): #Row with the lowest total score (first on ties).
+        return self._resolve_extremes()[1]
+
+    def average_percentage(self): #Average overall percentage.
+        return self.total_sum / self.count / Student.MAX_TOTAL * 100 if self.count else 0
+
+
+class StudentTable: #Columnar store holding every student's data in compact arrays.
+
+    def __init__(self): #Create empty columns.
+        self.codes = array('q') #Student codes.
+        self.coursework_columns = (array('i'), array('i'), array('i')) #Coursework marks m1, m2, m3.
+        self.exam_marks = array('i') #Examination marks.
+        self.totals = array('i') #Total overall scores (out of 160).
+        self.grades = array('B') #Grade codes, indexes into GRADE_LETTERS.
+        self._name_pool = bytearray() #Every name, UTF-8 encoded back to back.
+        self._name_ends = array('Q') #End offset of each name in the pool.
+        self._code_index = {} #Student code -> row of its first occurrence.
+        self._coded_rows = 0 #Rows already added to the code index.
+        self._name_index = {} #Trigram of a padded, case-folded name -> rows whose name contains it.
+        self._name_ranks = array('Q') #Rank key of every row in the name index: name length, then row.
+        self._character_counts = Counter() #Character -> indexed names containing it, to count 1-letter searches.
+        self.aggregates = ScoreAggregates(self) #Running statistics over the totals column.
+        self._snapshot = None #Memory map backing the columns when loaded from a snapshot.
+        self.version = 0 #Bumped on every change so derived caches (e.g. StudentAnalytics) know to rebuild.
+
+    def __len__(self): #Number of students stored.
+        return len(self.codes)
+
+    def __getitem__(self, row): #Return a Student view for a row.
+        if row < 0: #Support negative indexes like a list.
+            row += len(self)
+        if not 0 <= row < len(self): #Reject rows outside the table.
+            raise IndexError("student row out of range")
+        return Student._view(self, row)
+
+    def __iter__(self): #Iterate over Student views in file order.
+        for row in range(len(self)):
+            yield Student._view(self, row)
+
+    def name_at(self, row): #Decode one name from the pool.
+        start = self._name_ends[row - 1] if row else 0 #Names start where the previous one ended.
+        return str(self._name_pool[start:self._name_ends[row]], 'utf-8') #Works for bytearray and mapped pools.
+
+    def _columns(self): #Every fixed-width column, in snapshot order.
+        return (self.codes,) + self.coursework_columns + (self.exam_marks, self.totals, self.grades, self._name_ends)
+
+    def _ensure_writable(self): #Copy snapshot-mapped columns into arrays before the first edit.
+        if not isinstance(self.codes, memoryview): #Columns are already arrays.
+            return
+        copies = [] #Writable copies of each column.
+        for column in self._columns():
+            copy = array(column.format) #Same typecode as the mapped column.
+            copy.frombytes(column.cast('B')) #One bulk copy per column.
+            copies.append(copy)
+        self.codes, m1s, m2s, m3s, self.exam_marks, self.totals, self.grades, self._name_ends = copies
+        self.coursework_columns = (m1s, m2s, m3s)
+        self._name_pool = bytearray(self._name_pool)
+        self._snapshot = None #The mapping is no longer referenced by the columns.
+
+    def save_snapshot(self, snapshot_path, source_stat): #Write the table to a binary sidecar file.
+        aggregates = self.aggregates
+        histograms = [] #(score, count) pairs, flattened, for the total, coursework and exam histograms.
+        for counts in (aggregates.histogram, aggregates.mark_histograms["coursework"], aggregates.mark_histograms["exam"]):
+            histogram = array('q')
+            for score, count in sorted(counts.items()):
+                histogram.extend((score, count))
+            histograms.append(histogram)
+        high, low = aggregates.highest_row(), aggregates.lowest_row()
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_BYTE_ORDER, source_stat.st_size, source_stat.st_mtime_ns,
+                                      len(self), len(self._name_pool), -1 if high is None else high,
+                                      -1 if low is None else low, aggregates.total_sum,
+                                      *(len(histogram) // 2 for histogram in histograms))
+        temp_path = snapshot_path + ".tmp" #Write beside the target, then swap it in.
+        with open(temp_path, 'wb') as file:
+            file.write(header)
+            for column in tuple(histograms) + self._columns() + (self._name_pool,): #Each block padded to 8 bytes.
+                nbytes = memoryview(column).nbytes
+                file.write(column)
+                file.write(bytes(-nbytes % 8))
+        os.replace(temp_path, snapshot_path) #Readers never see a half-written snapshot.
+
+    @classmethod
+    def load_snapshot(cls, snapshot_path, source_stat): #Map a snapshot if it matches the source file, else None.
+        try:
+            with open(snapshot_path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) #Pages are read lazily by the OS.
+        except (OSError, ValueError): #Missing, unreadable or empty snapshot.
+            return None
+        try:
+            (magic, byte_order, size, mtime_ns, rows, pool_bytes, high, low, total_sum, histogram_entries,
+             coursework_entries, exam_entries) = SNAPSHOT_HEADER.unpack_from(mapped)
+        except struct.error: #Too short to hold a header.
+            return None
+        if (magic != SNAPSHOT_MAGIC or byte_order != SNAPSHOT_BYTE_ORDER
+                or size != source_stat.st_size or mtime_ns != source_stat.st_mtime_ns): #Stale or foreign snapshot.
+            return None
+
+        view = memoryview(mapped) #Slices of a memoryview share the mapping; nothing is copied.
+        offset = SNAPSHOT_HEADER.size
+        def take(typecode, count): #Cast the next block of the file to a typed column.
+            nonlocal offset
+            nbytes = array(typecode).itemsize * count
+            if offset + nbytes > len(view): #Truncated file.
+                raise ValueError("snapshot is truncated")
+            column = view[offset:offset + nbytes].cast(typecode)
+            offset += nbytes + (-nbytes % 8)
+            return column
+
+        table = cls() #Start from an empty table, then swap in the mapped columns.
+        try:
+            histogram = take('q', histogram_entries * 2)
+            coursework_histogram = take('q', coursework_entries * 2)
+            exam_histogram = take('q', exam_entries * 2)
+            table.codes = take('q', rows)
+            table.coursework_columns = (take('i', rows), take('i', rows), take('i', rows))
+            table.exam_marks = take('i', rows)
+            table.totals = take('i', rows)
+            table.grades = take('B', rows)
+            table._name_ends = take('Q', rows)
+            table._name_pool = take('B', pool_bytes)
+        except ValueError: #Truncated or corrupt snapshot.
+            return None
+        table._snapshot = mapped #Keep the mapping alive as long as the table.
+        aggregates = table.aggregates #Restore the statistics saved with the columns.
+        aggregates.count = rows
+        aggregates.total_sum = total_sum
+        aggregates.histogram = Counter(dict(zip(histogram[::2], histogram[1::2])))
+        aggregates.mark_histograms = {"coursework": Counter(dict(zip(coursework_histogram[::2], coursework_histogram[1::2]))),
+                                      "exam": Counter(dict(zip(exam_histogram[::2], exam_histogram[1::2])))}
+        aggregates._extremes = (None if high < 0 else high, None if low < 0 else low)
+        return table #Search indexes are rebuilt by index_codes and index_names.
+
+    def append(self, code, name, m1, m2, m3, exam): #Store one student.
+        self.extend([(code, name, m1, m2, m3, exam)])
+
+    def extend(self, rows): #Store many (code, name, m1, m2, m3, exam) rows column by column.
+        if not rows: #Nothing to add.
+            return
+        self._ensure_writable() #Snapshot-mapped columns are read-only.
+        first_row = len(self) #Row number of the first new student.
+        codes, names, m1s, m2s, m3s, exams = zip(*rows) #Transpose the rows into columns.
+        try: #Convert and check every value before anything is stored, so a bad row leaves the table unchanged.
+            codes = array('q', codes)
+            m1s, m2s, m3s, exams = array('i', m1s), array('i', m2s), array('i', m3s), array('i', exams)
+            names = [name.encode('utf-8') for name in names]
+        except (OverflowError, TypeError, AttributeError) as e: #A value that doesn't fit its column.
+            raise ValueError(f"Student rows don't fit the table: {e}") from None
+        coursework = list(map(sum, zip(m1s, m2s, m3s))) #Total coursework of every row.
+        if (min(min(m1s), min(m2s), min(m3s), min(exams)) < 0 or max(coursework) > Student.MAX_COURSEWORK
+                or max(exams) > Student.MAX_EXAM): #Marks outside 0..MAX.
+            raise ValueError("Student marks out of range")
+        totals = list(map(int.__add__, coursework, exams)) #Compute every total in one pass.
+        self.codes.extend(codes) #Append the codes column.
+        for column, marks in zip(self.coursework_columns, (m1s, m2s, m3s)): #Append each coursework column.
+            column.extend(marks)
+        self.exam_marks.extend(exams) #Append the exam column.
+        self.totals.extend(totals) #Append the totals column.
+        self.grades.extend(map(GRADE_BY_TOTAL.__getitem__, totals)) #Grade every row in one pass; totals are 0-160.
+        for name in names: #Add each name to the pool.
+            self._name_pool += name
+            self._name_ends.append(len(self._name_pool))
+        self.aggregates.add_totals(first_row, totals) #Fold the new totals into the running statistics.
+        self.aggregates.add_marks(coursework, exams)
+        self.version += 1
+
+    def update_marks(self, row, m1, m2, m3, exam): #Edit one student's marks and keep the statistics current.
+        check_marks(m1, m2, m3, exam) #Reject the edit before changing anything.
+        self._ensure_writable() #Snapshot-mapped columns are read-only.
+        old_total, old_exam = self.totals[row], self.exam_marks[row] #Remember the old scores for the aggregates.
+        for column, mark in zip(self.coursework_columns, (m1, m2, m3)): #Store the new coursework marks.
+            column[row] = mark
+        self.exam_marks[row] = exam #Store the new exam mark.
+        total = m1 + m2 + m3 + exam #Recompute the total.
+        self.totals[row] = total
+        self.grades[row] = GRADE_BY_TOTAL[total] #Regrade the row.
+        self.aggregates.replace_total(row, old_total, total) #Update the running statistics.
+        self.aggregates.replace_marks(old_total - old_exam, old_exam, total - exam, exam)
+        self.version += 1
+
+    def highest(self): #Student with the highest total score, or None.
+        row = self.aggregates.highest_row()
+        return None if row is None else self[row]
+
+    def lowest(self): #Student with the lowest total score, or None.
+        row = self.aggregates.lowest_row()
+        return None if row is None else self[row]
+
+    def index_codes(self, limit=None): #Add rows not yet in the code index (at most limit of them).
+        code_index, codes = self._code_index, self.codes #Local names keep the loop fast.
+        first = self._coded_rows #Only index rows added since the last call.
+        last = len(self) if limit is None else min(len(self), first + limit)
+        for row in range(first, last):
+            code_index.setdefault(codes[row], row) #Keep the first row for duplicate codes.
+        self._coded_rows = last
+        return last < len(self) #Whether rows are still waiting to be indexed.
+
+    def index_names(self, limit=None): #Add rows not yet in the name index (at most limit of them).
+        name_index, ranks = self._name_index, self._name_ranks #Local names keep the loop fast.
+        first = len(ranks) #Only index rows added since the last call.
+        last = len(self) if limit is None else min(len(self), first + limit)
+        characters = [] #Distinct characters of each new name, counted in one go below.
+        for row in range(first, last):
+            folded = self.name_at(row).casefold() #Case-fold once at index time.
+            for trigram in name_trigrams(folded): #Each distinct trigram once per name.
+                rows = name_index.get(trigram)
+                if rows is None: #First name containing this trigram.
+                    rows = name_index[trigram] = array('I')
+                rows.append(row)
+            ranks.append(len(folded) << RANK_ROW_BITS | row)
+            characters.extend(set(folded))
+        self._character_counts.update(characters)
+        return last < len(self) #Whether rows are still waiting to be indexed.
+
+    def find_code(self, code): #Return the row for a student code, or None.
+        self.index_codes() #Catch up on rows added since the last lookup; a dict insert per row.
+        return self._code_index.get(code)
+
+    def _name_postings(self, pattern): #Posting lists of the trigrams that start with pattern (1 to 3 characters).
+        if len(pattern) == 3: #A trigram is looked up directly.
+            rows = self._name_index.get(pattern)
+            return [rows] if rows else []
+        #Shorter patterns start one or more trigrams; the end padding makes that cover every occurrence.
+        return [rows for trigram, rows in self._name_index.items() if trigram.startswith(pattern)]
+
+    def _best_matches(self, postings, query, tier, wanted): #Best ranked rows in postings that match query in tier.
+        ranks = self._name_ranks
+        available = sum(map(len, postings)) #Entries to choose from, counting a row once per list holding it.
+        take = wanted #Candidates taken per round; doubled while too many of them fail to match.
+        while True:
+            keys = heapq.nsmallest(take, chain.from_iterable(map(ranks.__getitem__, rows) for rows in postings))
+            found = [key for key in dict.fromkeys(keys) #A row can sit in several lists.
+                     if match_tier(self.name_at(key & ROW_MASK).casefold(), query) == tier]
+            if len(found) >= wanted or take >= available: #Enough, or every candidate was checked.
+                return [(tier, key) for key in found[:wanted]]
+            take *= 2
+
+    def search_name(self, query, limit=None): #Best rows whose name contains query, and how many names do.
+        #Returns (rows, count, exact). Rows are ranked by where the query falls (start of the name, start of a later
+        #word, elsewhere), then by name length so an exact match leads, then by file order; at most limit are returned.
+        #count is an estimate when exact is False: a long query shared its trigrams with too many names to verify,
+        #or the name index hasn't reached every row yet.
+        query = query.casefold() #Match case-insensitively.
+        if not query: #An empty query matches nothing.
+            return [], 0, True
+        if limit is None: #Return every match.
+            limit = len(self)
+        ranked = [] #(tier, rank key) of the best matches.
+        if len(query) < 3: #The padded trigrams give the exact set of names, without decoding any.
+            contains = self._name_postings(query)
+            count = self._character_counts[query] if len(query) == 1 else len(set().union(*contains))
+            tiers = (self._name_postings(NAME_START + query), self._name_postings(" " + query), contains)
+            exact = True
+        else: #Narrow the candidates by the query's trigrams, rarest first, until few are left.
+            postings = sorted((self._name_index.get(query[i:i + 3], ()) for i in range(len(query) - 2)), key=len)
+            candidates = set(postings[0])
+            for rows in postings[1:]:
+                if len(candidates) <= NAME_COUNT_ROWS:
+                    break
+                candidates = candidates.intersection(rows)
+            if len(candidates) <= NAME_COUNT_ROWS: #Few enough to check and rank every one.
+                for row in candidates:
+                    folded = self.name_at(row).casefold()
+                    tier = match_tier(folded, query)
+                    if tier is not None:
+                        ranked.append((tier, len(folded) << RANK_ROW_BITS | row))
+                count, exact, tiers = len(ranked), True, ()
+            else: #Exact for a single trigram; longer queries are almost always in names holding all of theirs.
+                count, exact = len(candidates), len(query) == 3
+                tiers = ([candidates.intersection(self._name_index.get(NAME_START + query[:2], ()))],
+                         [candidates.intersection(self._name_index.get(" " + query[:2], ()))], [candidates])
+        for tier, postings in enumerate(tiers): #Fill from the best tier down, stopping once limit are found.
+            if len(ranked) < limit and count:
+                ranked += self._best_matches(postings, query, tier, limit - len(ranked))
+        indexed = len(self._name_ranks)
+        scan_end = min(len(self), indexed + NAME_SCAN_ROWS) #Rows the index hasn't reached are checked directly.
+        for row in range(indexed, scan_end):
+            folded = self.name_at(row).casefold()
+            tier = match_tier(folded, query)
+            if tier is not None:
+                count += 1
+                ranked.append((tier, len(folded) << RANK_ROW_BITS | row))
+        if scan_end < len(self): #Rows past the scan are neither counted nor listed yet.
+            exact = False
+        return [key & ROW_MASK for _, key in heapq.nsmallest(limit, ranked)], count, exact #Merge indexed and scanned matches.
+
+    def average_percentage(self): #Average overall percentage across the table.
+        return self.aggregates.average_percentage()
+
+    def nbytes(self): #Approximate memory used by the columns.
+        return sum(column.itemsize * len(column) for column in self._columns()) + len(self._name_pool)
+
+
+def name_trigrams(folded): #Distinct trigrams of a case-folded name between its start and end markers.
+    padded = NAME_START + folded + NAME_END
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def match_tier(folded, query): #0 if the name starts with query, 1 if a later word does, 2 if it's elsewhere, else None.
+    if folded.startswith(query):
+        return 0
+    if " " + query in folded:
+        return 1
+    return 2 if query in folded else None
+
+
+def parse_student_line(line): #Parse one data line into a (code, name, m1, m2, m3, exam) row, None for blank lines.
+    line = line.strip() #Clean up whitespace.
+    if not line: #Skip empty lines.
+        return None
+    parts = [p.strip() for p in line.split(',')] #Split by comma.
+    #Ensure we have 4 marks (m1, m2, m3, exam)
+    if len(parts) < 6: #Check for the correct number of fields.
+        raise ValueError(f"Warning: Skipping line due to insufficient data: {line}")
+    try:
+        code = int(parts[0]) #Student code.
+        name = parts[1] #Student name.
+        marks = [int(m) for m in parts[2:]] #Marks list.
+    except ValueError: #Handle cases where marks or code are not integers.
+        raise ValueError(f"Warning: Skipping line due to data format error: {line}") from None
+    try:
+        if not CODE_MIN <= code <= CODE_MAX: #The code must fit the table's 64-bit column.
+            raise ValueError
+        check_marks(*marks[:4])
+    except ValueError:
+        raise ValueError(f"Warning: Skipping line due to out-of-range value: {line}") from None
+    return (code, name, marks[0], marks[1], marks[2], marks[3]) #Row ready for StudentTable.
+
+
+def check_marks(m1, m2, m3, exam): #Raise ValueError unless the marks are within 0..MAX.
+    if min(m1, m2, m3, exam) < 0 or m1 + m2 + m3 > Student.MAX_COURSEWORK or exam > Student.MAX_EXAM:
+        raise ValueError(f"Marks out of range: {m1}, {m2}, {m3}, {exam}")
+
+
+def iter_student_chunks(file_path=DATA_FILE, chunk_size=CHUNK_SIZE, on_error=None): #Generator yielding lists of parsed rows.
+    with open(file_path, 'rb') as file: #Read bytes and decode line by line, so one bad byte costs one line.
+        next(file, None) #Skip the first line which is the count.
+        line_number = 1 #Track line numbers for error reporting.
+        while True: #Keep reading until the file is exhausted.
+            with phase("load.read"): #Time reading separately from parsing.
+                lines = list(islice(file, chunk_size)) #Read the next chunk of lines.
+            if not lines: #Stop at end of file.
+                return
+            with phase("load.parse"):
+                chunk = [] #Rows parsed from this chunk.
+                for line in lines: #Parse each line of the chunk.
+                    line_number += 1 #Advance the line counter.
+                    try:
+                        row = parse_student_line(line.decode('utf-8')) #Parse the line into a row (or None if blank).
+                    except UnicodeDecodeError: #Not UTF-8 text: report the line, keep loading.
+                        if on_error: on_error(line_number, "Warning: Skipping line that is not valid UTF-8: "
+                                                           + line.decode('utf-8', errors='replace').strip())
+                        continue
+                    except ValueError as e: #Report the bad line without stopping the load.
+                        if on_error: on_error(line_number, str(e))
+                        continue
+                    except Exception as e: #Catch any other unexpected errors.
+                        if on_error: on_error(line_number, f"An unexpected error occurred while processing line: {line.decode('utf-8', errors='replace').strip()}. Error: {e}")
+                        continue
+                    if row is not None: #Skip empty lines.
+                        chunk.append(row)
+            yield chunk #Hand the parsed chunk to the caller.
+
+
+def iter_load_table(file_path=DATA_FILE, use_snapshot=True, on_error=None, chunk_size=CHUNK_SIZE): #Load step by step.
+    #Yields (table, from snapshot) after the snapshot or each parsed chunk. OSError means the file can't be read;
+    #ValueError means the table rejected rows, and the table yielded last keeps everything stored before them.
+    source_stat = os.stat(file_path) #Recorded in the snapshot so later loads can check it.
+    if use_snapshot: #Reuse the binary snapshot when it matches the file.
+        with phase("load.snapshot"):
+            table = StudentTable.load_snapshot(file_path + SNAPSHOT_SUFFIX, source_stat)
+        if table is not None:
+            yield table, True
+            return
+    table = StudentTable() #Initialize an empty columnar table.
+    for chunk in iter_student_chunks(file_path, chunk_size, on_error): #Consume every parsed chunk.
+        with phase("load.grade"): #Totals, grades and aggregates are computed as rows are stored.
+            table.extend(chunk)
+        with phase("load.index"):
+            table.index_codes() #Codes are cheap to index; names are indexed after the load (index_names).
+        yield table, False
+    if use_snapshot and len(table): #Cache the parsed table for the next load.
+        try:
+            table.save_snapshot(file_path + SNAPSHOT_SUFFIX, source_stat)
+        except OSError as e: #E.g. a read-only directory; the next load just parses again.
+            print(f"Warning: Could not write snapshot for '{file_path}': {e}")
+
+
+def load_table(file_path=DATA_FILE, use_snapshot=True, on_error=None): #Load a whole file into a StudentTable.
+    table = StudentTable() #Returned as is for a file with no data lines.
+    for table, _ in iter_load_table(file_path, use_snapshot, on_error):
+        pass
+    return table
@@ -0,0 +1 @@
+#Unit tests and pytest-benchmark cases for the portfolio modules; run with python -m pytest from the repository root.
@@ -0,0 +1,29 @@
+import pytest #Import pytest for the shared fixtures.
+
+from benchmarks import make_roster_rows, write_joke_csv, write_roster_file #Reuse the benchmark data generators.
+from student_store import StudentTable #Import the columnar student store.
+
+ROSTER_SIZE = 2000 #Students in the synthetic roster most tests use.
+JOKE_COUNT = 600 #Rows in the synthetic joke CSV.
+
+
+@pytest.fixture
+def roster_rows(): #(code, name, m1, m2, m3, exam) rows for a synthetic class.
+    return make_roster_rows(ROSTER_SIZE)
+
+
+@pytest.fixture
+def table(roster_rows): #A parsed StudentTable holding the synthetic class.
+    table = StudentTable()
+    table.extend(roster_rows)
+    return table
+
+
+@pytest.fixture
+def roster_file(tmp_path): #The synthetic class written as a studentMarks.txt file.
+    return write_roster_file(str(tmp_path / "studentMarks.txt"), ROSTER_SIZE)
+
+
+@pytest.fixture
+def jokes_csv(tmp_path): #A synthetic shortjokes.csv with a mix of question jokes and one-liners.
+    return write_joke_csv(str(tmp_path / "shortjokes.csv"), JOKE_COUNT)
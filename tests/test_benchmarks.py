@@ -0,0 +1,33 @@
+import importlib.util #Import importlib.util to see whether pytest-benchmark is installed.
+
+import pytest #Import pytest for fixtures, parametrization and skips.
+
+from benchmarks import suite_cases #Reuse the benchmark suite's cases and generators.
+
+SUITE_SIZE = 3000 #Records per case: big enough to exercise every path, small enough for a test run.
+SUITE_CASES = ["student.load_table.parse", "student.load_table.snapshot", "student.index_names", "student.search.code",
+               "student.search.name", "student.search.short", "student.extreme_score", "student.analytics.total",
+               "student.analytics.exam", "student.analytics.coursework", "student.analytics.ranks",
+               "student.update_marks", "jokes.load.csv", "jokes.load.preprocessed", "jokes.draw.x1000",
+               "quiz.generate", "quiz.check_answers", "quiz.replay"] #Every case the suite times, in order.
+needs_benchmark = pytest.mark.skipif(importlib.util.find_spec("pytest_benchmark") is None,
+                                     reason="timing needs pytest-benchmark")
+
+
+@pytest.fixture(scope="module")
+def suite(tmp_path_factory): #Run the suite's generators once; returns (cases, failed checks).
+    failures = []
+    cases = dict(suite_cases(SUITE_SIZE, str(tmp_path_factory.mktemp("suite")), failures))
+    return cases, failures
+
+
+def test_suite_checks_pass(suite):
+    cases, failures = suite
+    assert failures == []
+    assert list(cases) == SUITE_CASES
+
+
+@needs_benchmark
+@pytest.mark.parametrize("name", SUITE_CASES)
+def test_benchmark(benchmark, suite, name): #Time one suite case; compare runs with --benchmark-compare.
+    benchmark(suite[0][name])
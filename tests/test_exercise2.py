@@ -0,0 +1,80 @@
+import errno #Import errno to simulate a full disk.
+import os #Import os to look for leftover corpus files.
+import random #Import random for reproducible samplers.
+
+import pytest #Import pytest for parametrized sizes and monkeypatching.
+
+import exercise2 #Import the module itself to patch the corpus writer.
+from benchmarks import csv_jokes #Reuse the benchmark's direct CSV reader as the expected corpus.
+from exercise2 import (PREPROCESSED_SUFFIX, IndexedSampler, JokeIndex, PreprocessedJokes, ReservoirSampler, #Import
+                       ShuffledOrder, load_and_prepare_jokes) #the loader and samplers under test.
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 64, 1000])
+def test_shuffled_order_visits_every_position_once(n):
+    order = list(ShuffledOrder(n, random.Random(n)))
+    assert sorted(order) == list(range(n))
+
+
+def test_shuffled_order_depends_on_the_keys():
+    assert list(ShuffledOrder(100, random.Random(1))) != list(ShuffledOrder(100, random.Random(2)))
+
+
+def test_indexed_sampler_tells_every_joke_before_repeating():
+    jokes = [(f"setup {i}", f"punchline {i}") for i in range(50)]
+    sampler = IndexedSampler(jokes, no_repeat=True, rng=random.Random(0))
+    assert sorted(sampler.draw() for _ in range(50)) == sorted(jokes)
+    assert sorted(sampler.draw() for _ in range(50)) == sorted(jokes) #Second round.
+
+
+def test_indexed_sampler_covers_jokes_added_while_drawing():
+    jokes = list(range(100))
+    sampler = IndexedSampler(jokes, no_repeat=True, rng=random.Random(1))
+    first = [sampler.draw() for _ in range(60)]
+    jokes.extend(range(100, 150)) #A loader batch arrives mid-round.
+    rest = [sampler.draw() for _ in range(90)]
+    assert sorted(first + rest) == list(range(150))
+    assert set(rest[:40]) == set(range(100)) - set(first) #The first round finishes before the new jokes.
+
+
+def test_samplers_on_an_empty_corpus(tmp_path):
+    assert IndexedSampler([], no_repeat=True).draw() is None
+    path = tmp_path / "empty.csv"
+    path.write_text("ID,Joke\n1,No question here.\n")
+    assert ReservoirSampler(str(path)).draw() is None
+
+
+def test_reservoir_sampler_draws_question_jokes(jokes_csv):
+    jokes = csv_jokes(jokes_csv)
+    sample = ReservoirSampler(jokes_csv, random.Random(0)).sample(20)
+    assert len(sample) == 20 and all(joke in jokes for joke in sample)
+
+
+def test_load_builds_then_reuses_the_preprocessed_corpus(jokes_csv):
+    expected = csv_jokes(jokes_csv)
+    first = load_and_prepare_jokes(jokes_csv) #Scans the CSV and writes the corpus.
+    assert list(first) == expected
+    assert os.path.exists(jokes_csv + PREPROCESSED_SUFFIX)
+    second = load_and_prepare_jokes(jokes_csv)
+    assert isinstance(second, PreprocessedJokes) and list(second) == expected
+
+
+def test_load_rebuilds_a_stale_corpus(jokes_csv):
+    load_and_prepare_jokes(jokes_csv)
+    with open(jokes_csv, "a", newline="") as file: #The CSV changes after it was preprocessed.
+        file.write("9999,What changed? The file\n")
+    assert list(load_and_prepare_jokes(jokes_csv)) == csv_jokes(jokes_csv)
+
+
+@pytest.mark.parametrize("method", ["add", "finish"])
+def test_load_survives_a_full_disk(jokes_csv, monkeypatch, method):
+    def full_disk(*args): #Every write of the corpus fails.
+        raise OSError(errno.ENOSPC, "No space left on device")
+    monkeypatch.setattr(exercise2.PreprocessedJokesWriter, method, full_disk)
+    jokes = load_and_prepare_jokes(jokes_csv)
+    assert isinstance(jokes, JokeIndex) and list(jokes) == csv_jokes(jokes_csv) #Served from the CSV offsets.
+    assert not os.path.exists(jokes_csv + PREPROCESSED_SUFFIX + ".tmp")
+
+
+def test_load_missing_file_gives_no_jokes(tmp_path):
+    assert load_and_prepare_jokes(str(tmp_path / "missing.csv")) == []
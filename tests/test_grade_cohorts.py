@@ -0,0 +1,47 @@
+import json #Import json to read the --json report back.
+
+from benchmarks import write_roster_file #Reuse the benchmark's roster generator for cohort files.
+from grade_cohorts import grade_files, main, merge_summaries, summarize_file #Import the batch grader.
+from student_store import GRADE_LETTERS, load_table #Import the loader to compute expected results directly.
+
+
+def test_summarize_file_matches_the_table(roster_file):
+    summary = summarize_file(roster_file)
+    table = load_table(roster_file, use_snapshot=False)
+    assert (summary["count"], summary["total_sum"], summary["errors"]) == (len(table), sum(table.totals), 0)
+    assert summary["grades"] == {letter: table.grades.count(code) for code, letter in enumerate(GRADE_LETTERS)}
+    assert summary["highest"]["code"] == table.highest().code and summary["lowest"]["code"] == table.lowest().code
+
+
+def test_summarize_file_reports_bad_lines_and_missing_files(tmp_path):
+    path = tmp_path / "cohort.txt"
+    path.write_text("3\n1000, Ada Lovelace, 20, 20, 20, 100\nnot a student\n1001, Alan Turing, 10, 10, 10, 50\n")
+    summary = summarize_file(str(path))
+    assert (summary["count"], summary["errors"]) == (2, 1)
+    assert "error" in summarize_file(str(tmp_path / "missing.txt"))
+
+
+def test_merge_summaries_combines_cohorts(tmp_path):
+    paths = [write_roster_file(str(tmp_path / f"cohort{seed}.txt"), 500, seed) for seed in (1, 2)]
+    summaries = [summarize_file(path) for path in paths] + [summarize_file(str(tmp_path / "missing.txt"))]
+    merged = merge_summaries(summaries)
+    tables = [load_table(path, use_snapshot=False) for path in paths]
+    assert (merged["files"], merged["count"]) == (2, 1000)
+    assert merged["total_sum"] == sum(sum(table.totals) for table in tables)
+    assert merged["highest"]["total"] == max(table.highest().total_score for table in tables)
+    assert merged["lowest"]["total"] == min(table.lowest().total_score for table in tables)
+    assert sum(merged["grades"].values()) == 1000
+
+
+def test_grade_files_keeps_input_order(tmp_path):
+    paths = [write_roster_file(str(tmp_path / f"cohort{seed}.txt"), 200 + seed, seed) for seed in range(3)]
+    summaries = grade_files(paths, workers=2)
+    assert [summary["file"] for summary in summaries] == paths
+    assert [summary["count"] for summary in summaries] == [200, 201, 202]
+
+
+def test_main_writes_a_json_report(tmp_path, roster_file):
+    output = tmp_path / "report.json"
+    assert main([roster_file, "-o", str(output), "-j", "1", "--json"]) == 0
+    assert json.loads(output.read_text())["summary"]["count"] == 2000
+    assert main([roster_file, str(tmp_path / "missing.txt"), "-o", str(output), "-j", "1"]) == 1
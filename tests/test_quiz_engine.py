@@ -0,0 +1,31 @@
+from benchmarks import record_quizzes #Reuse the benchmark's simulated clients to write a real event log.
+from quiz_engine import EVENT_ANSWER, EVENT_HEADER, EVENT_START, read_events, replay #Import the log reader and replay.
+
+QUIZZES = 40 #Simulated quizzes per log.
+
+
+def test_replay_reproduces_every_logged_answer(tmp_path):
+    log_path = str(tmp_path / "quiz_events.log")
+    logged = record_quizzes(log_path, QUIZZES)
+    result = replay(log_path)
+    assert (result["sessions"], result["answers"], result["mismatches"]) == (QUIZZES, logged, 0)
+
+
+def test_read_events_stops_at_a_torn_record(tmp_path):
+    log_path = tmp_path / "quiz_events.log"
+    record_quizzes(str(log_path), QUIZZES)
+    events = list(read_events(str(log_path)))
+    data = log_path.read_bytes()
+    log_path.write_bytes(data[:-3]) #Crash part-way through the last record.
+    assert list(read_events(str(log_path))) == events[:-1]
+    assert replay(str(log_path))["mismatches"] == 0 #The unfinished session is simply never ended.
+
+
+def test_read_events_stops_at_an_unknown_kind(tmp_path):
+    log_path = tmp_path / "quiz_events.log"
+    record_quizzes(str(log_path), QUIZZES)
+    events = list(read_events(str(log_path)))
+    assert events[0][0] == EVENT_START and any(kind == EVENT_ANSWER for kind, _, _, _ in events)
+    with open(log_path, "ab") as file: #Garbage after the last good record.
+        file.write(EVENT_HEADER.pack(99, 1, 0) + bytes(16))
+    assert list(read_events(str(log_path))) == events
@@ -0,0 +1,66 @@
+import pytest #Import pytest for parametrized keys.
+
+from student_analytics import MAX_SCORE, SCORE_KEYS, StudentAnalytics #Import the analytics engine under test.
+from student_store import GRADE_LETTERS, Student, load_table #Import the store and its loader.
+
+
+def sorted_rows(values, highest): #Every row ordered by score, file order on ties: the full sort top/bottom-k replace.
+    return sorted(range(len(values)), key=(lambda row: -values[row]) if highest else values.__getitem__)
+
+
+def column_values(table, key): #Per-row scores read straight from the Student views.
+    scores = {"total": lambda s: s.total_score, "exam": lambda s: s.exam_mark, "coursework": lambda s: s.total_coursework}
+    return [scores[key](student) for student in table]
+
+
+@pytest.mark.parametrize("key", SCORE_KEYS)
+def test_top_and_bottom_k_match_a_full_sort(table, key):
+    analytics = StudentAnalytics(table)
+    values = column_values(table, key)
+    assert analytics.values(key) == values
+    for k in (0, 1, 10, 250, len(table) + 5): #k larger than the table returns every row.
+        assert analytics.top_k(k, key) == sorted_rows(values, True)[:k]
+        assert analytics.bottom_k(k, key) == sorted_rows(values, False)[:k]
+
+
+def test_rankings_follow_edits(table):
+    analytics = StudentAnalytics(table)
+    analytics.top_k(10) #Fill the caches before the edit.
+    table.update_marks(42, 20, 20, 20, 100)
+    table.update_marks(43, 0, 0, 0, 0)
+    values = column_values(table, "total")
+    assert analytics.top_k(10) == sorted_rows(values, True)[:10] and analytics.top_k(1) == [42]
+    assert analytics.bottom_k(10) == sorted_rows(values, False)[:10]
+
+
+def test_snapshot_table_ranks_like_parsed_one(roster_file):
+    parsed = load_table(roster_file)
+    mapped = load_table(roster_file) #Second load maps the snapshot.
+    for key in SCORE_KEYS:
+        assert StudentAnalytics(mapped).top_k(20, key) == StudentAnalytics(parsed).top_k(20, key)
+        assert StudentAnalytics(mapped).histogram(key) == StudentAnalytics(parsed).histogram(key)
+
+
+def test_grade_histogram_matches_row_grades(table):
+    grades = StudentAnalytics(table).grade_histogram()
+    assert list(grades) == list(GRADE_LETTERS)
+    assert grades == {letter: sum(student.grade == letter for student in table) for letter in GRADE_LETTERS}
+
+
+def test_percentile_ranks(table):
+    analytics = StudentAnalytics(table)
+    values = column_values(table, "total")
+    ranks = analytics.percentile_ranks()
+    for row in (0, 17, len(values) - 1): #Students below, counting ties as half.
+        below = sum(value < values[row] for value in values) + 0.5 * (values.count(values[row]))
+        assert ranks[row] == pytest.approx(below / len(values) * 100)
+        assert analytics.percentile_rank(row) == ranks[row]
+
+
+def test_unknown_key_is_rejected(table):
+    with pytest.raises(ValueError):
+        StudentAnalytics(table).top_k(3, "attendance")
+
+
+def test_max_score_matches_student_limits():
+    assert MAX_SCORE == {"total": Student.MAX_TOTAL, "coursework": Student.MAX_COURSEWORK, "exam": Student.MAX_EXAM}
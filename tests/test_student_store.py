@@ -0,0 +1,132 @@
+import os #Import os to change a source file's size and timestamp.
+
+import pytest #Import pytest for assertions on exceptions and monkeypatching.
+
+import student_store #Import the module itself to shrink its scan limits.
+from benchmarks import consistent_aggregates, same_table #Reuse the benchmark checks as assertions.
+from student_store import Student, StudentTable, iter_load_table, load_table, match_tier #Import the store under test.
+
+
+def scan_matches(table, query, limit=None): #Every match by a linear scan, ranked like search_name; and their count.
+    query = query.casefold()
+    matches = []
+    for row in range(len(table)):
+        folded = table.name_at(row).casefold()
+        tier = match_tier(folded, query)
+        if tier is not None:
+            matches.append((tier, len(folded), row))
+    matches.sort()
+    return [row for _, _, row in matches[:limit]], len(matches)
+
+
+def test_extend_stores_columns_and_grades(table, roster_rows):
+    assert len(table) == len(roster_rows)
+    for row in (0, 1, len(roster_rows) - 1): #Spot-check first, second and last rows.
+        code, name, m1, m2, m3, exam = roster_rows[row]
+        student = table[row]
+        assert (student.code, student.name, student.coursework_marks, student.exam_mark) == (code, name, [m1, m2, m3], exam)
+        assert student.total_score == m1 + m2 + m3 + exam
+        assert student.grade == Student.grade_for_percentage(student.total_score / Student.MAX_TOTAL * 100)
+    assert table[-1].code == roster_rows[-1][0] #Negative indexes work like a list.
+
+
+def test_extend_rejects_bad_rows_without_storing_any(table):
+    with pytest.raises(ValueError):
+        table.extend([(1, "Good Row", 10, 10, 10, 50), (2, "Too Many Marks", 30, 30, 30, 50)])
+    with pytest.raises(ValueError):
+        table.extend([(2**70, "Huge Code", 1, 1, 1, 1)])
+    assert len(table) == 2000
+    assert consistent_aggregates(table) is not None
+
+
+def test_snapshot_round_trip(roster_file):
+    parsed = load_table(roster_file) #Parses the file and writes the snapshot.
+    assert os.path.exists(roster_file + student_store.SNAPSHOT_SUFFIX)
+    table, from_snapshot = next(iter_load_table(roster_file))
+    assert from_snapshot
+    assert same_table(parsed, table)
+    table.update_marks(0, 20, 20, 20, 100) #Editing copies the mapped columns.
+    assert table.totals[0] == 160 and consistent_aggregates(table) is not None
+
+
+def test_snapshot_ignored_when_source_changes(roster_file):
+    rows = len(load_table(roster_file))
+    with open(roster_file, "a") as file: #Append one more student.
+        file.write("999999, Late Joiner, 10, 10, 10, 50\n")
+    table, from_snapshot = next(iter_load_table(roster_file))
+    assert not from_snapshot
+    assert len(load_table(roster_file)) == rows + 1
+
+
+def test_load_reports_bad_lines_and_keeps_good_ones(tmp_path):
+    path = tmp_path / "marks.txt"
+    path.write_bytes(b"3\n1, Ana Silva, 10, 10, 10, 50\n2, Bad \xff Byte, 1, 1, 1, 1\nnot a record\n"
+                     b"3, Bo Chen, 20, 20, 20, 100\n")
+    errors = []
+    table = load_table(str(path), use_snapshot=False, on_error=lambda line, message: errors.append(line))
+    assert [student.name for student in table] == ["Ana Silva", "Bo Chen"]
+    assert errors == [3, 4]
+
+
+def test_load_missing_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        load_table(str(tmp_path / "missing.txt"))
+
+
+def test_update_marks_keeps_aggregates_current(table):
+    for row, marks in ((5, (20, 20, 20, 100)), (5, (0, 0, 0, 0)), (7, (0, 0, 0, 0)), (7, (10, 10, 10, 10))):
+        table.update_marks(row, *marks)
+        totals = table.totals.tolist()
+        assert table.highest().total_score == max(totals) and table.lowest().total_score == min(totals)
+        assert table.highest().code == table.codes[totals.index(max(totals))] #First row on ties.
+        assert consistent_aggregates(table) is not None
+    with pytest.raises(ValueError):
+        table.update_marks(0, 21, 20, 20, 100)
+
+
+def test_find_code(table, roster_rows):
+    assert table.find_code(roster_rows[123][0]) == 123
+    assert table.find_code(-5) is None
+    table.append(roster_rows[0][0], "Duplicate Code", 1, 1, 1, 1)
+    assert table.find_code(roster_rows[0][0]) == 0 #The first row wins.
+
+
+@pytest.mark.parametrize("query", ["a", "bo", "smith", "ith", "Alice Smith", "ALICE", "smith-19", "-1", "ü",
+                                   "müller", "zz", "nobody here"])
+def test_search_name_matches_scan(table, query):
+    table.index_names()
+    for limit in (1, 10, None):
+        rows, count, exact = table.search_name(query, limit)
+        expected, matches = scan_matches(table, query, limit)
+        assert rows == expected
+        assert count == matches if exact else count >= matches
+
+
+def test_search_name_ranks_exact_and_prefix_first(table):
+    table.extend([(1, "bo", 1, 1, 1, 1), (2, "Bob Jones", 1, 1, 1, 1), (3, "Jimbo", 1, 1, 1, 1)])
+    table.index_names()
+    rows, _, _ = table.search_name("bo", 3)
+    assert [table.name_at(row) for row in rows][:2] == ["bo", "Bob Jones"]
+
+
+def test_search_name_scans_rows_not_yet_indexed(table, monkeypatch):
+    table.index_names(500) #Background indexing has only reached part of the table.
+    rows, count, exact = table.search_name("smith")
+    assert exact and (rows, count) == scan_matches(table, "smith")
+    monkeypatch.setattr(student_store, "NAME_SCAN_ROWS", 100) #Too few to reach the end of the table.
+    rows, count, exact = table.search_name("smith")
+    assert not exact and count < scan_matches(table, "smith")[1]
+
+
+def test_search_name_estimates_counts_of_common_long_queries(table, monkeypatch):
+    table.index_names()
+    monkeypatch.setattr(student_store, "NAME_COUNT_ROWS", 10)
+    rows, count, exact = table.search_name("smith", 10)
+    expected, matches = scan_matches(table, "smith", 10)
+    assert rows == expected and not exact and count >= matches
+
+
+def test_empty_table():
+    table = StudentTable()
+    assert (table.highest(), table.lowest(), table.average_percentage()) == (None, None, 0)
+    assert table.search_name("a") == ([], 0, True) and table.find_code(1) is None